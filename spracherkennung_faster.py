@@ -5,66 +5,186 @@ Bessere Performance auf Intel i5-7200U mit 16GB RAM
 """
 
 import sys
-import pyaudio
 import wave
 import threading
+import queue
+import socket
 import time
-import pyperclip
-import tkinter as tk
-from tkinter import ttk
 import os
 import re
 import argparse
 import subprocess
 import gc  # Garbage Collection für besseres Memory-Management
 import logging
-from logging.handlers import RotatingFileHandler
+import atexit
+import importlib
+import json
+import itertools
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 
-# Auto-Paste Funktionalität
-try:
-    import pyautogui
-    PYAUTOGUI_AVAILABLE = True
-    pyautogui.PAUSE = 0.1  # Schnellere Reaktion
-except ImportError:
-    PYAUTOGUI_AVAILABLE = False
-
-# Versuche bessere Hotkey-Bibliothek für globale Hotkeys
-try:
-    import keyboard as kb  # keyboard library für bessere globale Hotkeys
-    KEYBOARD_AVAILABLE = True
-except ImportError:
-    KEYBOARD_AVAILABLE = False
-    # Fallback auf pynput
-    from pynput import keyboard
-    from pynput.keyboard import Key, Listener
-
-# AIMP Lautstärke-Kontrolle
-try:
-    from pycaw.pycaw import AudioUtilities, ISimpleAudioVolume
-    PYCAW_AVAILABLE = True
-except ImportError:
-    PYCAW_AVAILABLE = False
-    print("⚠️ pycaw nicht installiert (für AIMP-Kontrolle). Optional: pip install pycaw")
-
-# Faster-Whisper für bessere CPU Performance
-try:
-    from faster_whisper import WhisperModel
-    FASTER_WHISPER_AVAILABLE = True
-except ImportError:
-    FASTER_WHISPER_AVAILABLE = False
-    print("⚠️ Faster-Whisper nicht installiert. Installieren mit:")
-    print("   pip install faster-whisper")
+# Schwere und optionale Abhängigkeiten (pyaudio, tkinter, pyautogui, keyboard/pynput,
+# pycaw, faster-whisper) werden erst im jeweiligen Subsystem importiert. Dadurch
+# starten --help und die Headless-Modi ohne die Import-Kosten der GUI-Bibliotheken.
+_process_start = time.perf_counter()
+_lazy_modules = {}
+startup_profile = []  # (Phase, Sekunden) für --profile-startup
+
+def record_startup(phase, seconds):
+    """Merkt sich die Dauer einer Startphase für --profile-startup"""
+    startup_profile.append((phase, seconds))
+
+@contextmanager
+def startup_phase(phase):
+    """Misst die Dauer eines Startabschnitts"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_startup(phase, time.perf_counter() - start)
+
+def lazy_import(module_name):
+    """Importiert ein Modul beim ersten Zugriff (gecacht), None falls nicht installiert"""
+    if module_name not in _lazy_modules:
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            module = None
+        record_startup(f"import {module_name}", time.perf_counter() - start)
+        _lazy_modules[module_name] = module
+    return _lazy_modules[module_name]
+
+def get_pyautogui():
+    """Auto-Paste Funktionalität (optional)"""
+    pyautogui = lazy_import("pyautogui")
+    if pyautogui is not None:
+        pyautogui.PAUSE = 0.1  # Schnellere Reaktion
+    return pyautogui
+
+def get_keyboard():
+    """keyboard library für bessere globale Hotkeys (optional, sonst pynput)"""
+    return lazy_import("keyboard")
+
+def get_pycaw():
+    """AIMP Lautstärke-Kontrolle über die Windows Audio API (optional)"""
+    pycaw = lazy_import("pycaw.pycaw")
+    if pycaw is None and "pycaw-hinweis" not in _lazy_modules:
+        _lazy_modules["pycaw-hinweis"] = True
+        print("⚠️ pycaw nicht installiert (für AIMP-Kontrolle). Optional: pip install pycaw")
+    return pycaw
+
+def get_whisper_model_class():
+    """Faster-Whisper für bessere CPU Performance, None falls nicht installiert"""
+    faster_whisper = lazy_import("faster_whisper")
+    if faster_whisper is None:
+        return None
+    return faster_whisper.WhisperModel
+
+def report_startup_profile():
+    """Gibt aus, wohin die Startzeit geflossen ist (--profile-startup)"""
+    total = time.perf_counter() - _process_start
+    logger.info("=" * 60)
+    logger.info(f"  Startzeit-Profil: {total*1000:.0f}ms seit Modul-Import bis bereit")
+    for phase, seconds in sorted(startup_profile, key=lambda item: item[1], reverse=True):
+        share = seconds / total * 100 if total else 0.0
+        logger.info(f"  {seconds*1000:8.1f}ms  {share:5.1f}%  {phase}")
+    logger.info("=" * 60)
 
 # Logging-Konfiguration
-def setup_logging():
-    """Richtet das Logging-System ein (Datei + Console)"""
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler, der nicht nach jedem Eintrag auf die Platte schreibt.
+    Geflusht wird gebündelt vom Log-Listener (Intervall, Fehler oder flush_logger())"""
+
+    def flush(self):
+        # StreamHandler.emit() ruft flush() nach jedem Eintrag auf - hier bewusst nichts tun
+        pass
+
+    def force_flush(self):
+        """Schreibt den Puffer tatsächlich auf die Platte"""
+        super().flush()
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener, der Log-Einträge im Hintergrund gebündelt schreibt.
+    Flush nur bei ERROR/CRITICAL, nach flush_interval oder auf Anforderung"""
+
+    def __init__(self, log_queue, *handlers, batch_size=200, flush_interval=1.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+    def _monitor(self):
+        dirty = False
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if dirty:
+                    self._flush_handlers()
+                    dirty = False
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            urgent = False
+            flush_requests = []
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                elif isinstance(record, threading.Event):
+                    flush_requests.append(record)
+                else:
+                    self.handle(record)
+                    dirty = True
+                    if record.levelno >= logging.ERROR:
+                        urgent = True
+
+            if dirty and (urgent or stop or flush_requests):
+                self._flush_handlers()
+                dirty = False
+            for request in flush_requests:
+                request.set()
+            if stop:
+                break
+
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            try:
+                if isinstance(handler, BufferedRotatingFileHandler):
+                    handler.force_flush()
+                else:
+                    handler.flush()
+            except Exception:
+                pass
+
+    def flush(self, timeout=1.0):
+        """Wartet bis alle bisherigen Einträge geschrieben sind"""
+        if self._thread is None:
+            return
+        request = threading.Event()
+        self.queue.put(request)
+        request.wait(timeout)
+
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+log_listener = None
+logger = logging.getLogger("Spracherkennung")
+
+def setup_logging(console_level="INFO", file_level="DEBUG"):
+    """Richtet das Logging-System ein (Datei + Console, geschrieben von einem Hintergrund-Thread)"""
+    global log_listener
+
     log_dir = os.path.dirname(os.path.abspath(__file__))
     log_file = os.path.join(log_dir, "spracherkennung.log")
 
     # Logger erstellen
     logger = logging.getLogger("Spracherkennung")
-    logger.setLevel(logging.DEBUG)
 
     # Format für Log-Einträge
     formatter = logging.Formatter(
@@ -72,25 +192,34 @@ def setup_logging():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
 
+    handlers = []
+
     # Handler für Log-Datei (mit Rotation: max 5MB pro Datei, max 5 Dateien)
     try:
-        file_handler = RotatingFileHandler(
+        file_handler = BufferedRotatingFileHandler(
             log_file,
             maxBytes=5*1024*1024,  # 5MB
             backupCount=5,
             encoding='utf-8'
         )
-        file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
     except Exception as e:
         print(f"⚠️ Fehler beim Erstellen der Log-Datei: {e}")
 
     # Handler für Console
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
+
+    # Aufrufende Threads legen Einträge nur in die Queue, geschrieben wird im Listener-Thread
+    log_queue = queue.Queue()
+    logger.addHandler(QueueHandler(log_queue))
+    log_listener = BatchingQueueListener(log_queue, *handlers)
+    log_listener.start()
+    atexit.register(stop_logging)
+
+    set_log_levels(console_level, file_level, logger)
 
     logger.info("=" * 70)
     logger.info("Spracherkennung gestartet")
@@ -99,13 +228,30 @@ def setup_logging():
 
     return logger
 
-# Logger global verfügbar machen
-logger = setup_logging()
+def set_log_levels(console_level, file_level, target_logger=None):
+    """Setzt die Log-Level für Console und Datei"""
+    target_logger = target_logger or logger
+    console_level = logging.getLevelName(console_level.upper())
+    file_level = logging.getLevelName(file_level.upper())
+
+    for handler in log_listener.handlers:
+        if isinstance(handler, BufferedRotatingFileHandler):
+            handler.setLevel(file_level)
+        else:
+            handler.setLevel(console_level)
+
+    # Einträge unterhalb beider Level werden gar nicht erst erzeugt
+    target_logger.setLevel(min(console_level, file_level))
+
+def stop_logging():
+    """Beendet den Log-Listener und schreibt alle ausstehenden Einträge"""
+    if log_listener and log_listener._thread is not None:
+        log_listener.stop()
 
 def flush_logger():
-    """Stellt sicher, dass alle Log-Einträge sofort geschrieben werden"""
-    for handler in logger.handlers:
-        handler.flush()
+    """Stellt sicher, dass alle Log-Einträge geschrieben sind (nur für kritische Pfade)"""
+    if log_listener:
+        log_listener.flush()
 
 def handle_exception(exc_type, exc_value, exc_traceback):
     """Globaler Exception Handler - erfasst alle unkontrollierten Fehler"""
@@ -132,11 +278,2149 @@ def handle_thread_exception(args):
 # Installiere Thread Exception Handler
 threading.excepthook = handle_thread_exception
 
+def format_metrics(metrics):
+    """Formatiert ein Metrik-Dictionary als kompakte Log-Zeile"""
+    parts = []
+    for key, value in metrics.items():
+        if isinstance(value, float):
+            parts.append(f"{key}={value:.3f}")
+        else:
+            parts.append(f"{key}={value}")
+    return ", ".join(parts)
+
+def log_mel_spectrogram(waveform, extractor, padding=True, chunk_frames=2048):
+    """Vektorisierte Variante von FeatureExtractor.__call__ (gleiche Ergebnisse):
+    Frames als Sliding-Window-View, rfft blockweise statt einer FFT pro Frame in Python"""
+    import numpy as np
+
+    waveform = np.asarray(waveform, dtype=np.float32)
+    if padding:
+        waveform = np.pad(waveform, [(0, extractor.n_samples)])
+
+    n_fft = extractor.n_fft
+    half_window = (n_fft - 1) // 2 + 1
+    padded = np.pad(waveform, half_window, mode="reflect")
+    # Wie im Original: letzter Frame wird verworfen
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::extractor.hop_length][:-1]
+
+    window = np.hanning(n_fft + 1)[:-1]
+    filters = extractor.mel_filters
+    mel_spec = np.empty((filters.shape[0], len(frames)), dtype=np.float32)
+    for start in range(0, len(frames), chunk_frames):
+        spectrum = np.fft.rfft(frames[start:start + chunk_frames] * window, axis=1).astype(np.complex64)
+        mel_spec[:, start:start + chunk_frames] = filters @ (np.abs(spectrum) ** 2).T
+
+    log_spec = np.log10(np.clip(mel_spec, a_min=1e-10, a_max=None))
+    log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    return (log_spec + 4.0) / 4.0
+
+class CachedFeatureExtractor:
+    """Ersetzt model.feature_extractor: berechnet Log-Mel-Features vektorisiert und hält sie
+    in einem kleinen LRU-Cache, Schlüssel (Puffer-ID, Ausschnitt, Länge, chunk_length, n_mels).
+    Nur Aufrufe innerhalb von scope() werden gecacht. Ausschnitte mit Quell-Puffer (scope(..., source=))
+    werden aus den Features des ganzen Puffers geschnitten, die einmal pro Puffer berechnet werden -
+    eine Näherung, nicht identisch mit den Features des Ausschnitts allein (siehe _slice_source)."""
+
+    def __init__(self, extractor, max_entries=4):
+        self.extractor = extractor
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def __getattr__(self, name):
+        # hop_length, nb_max_frames, sampling_rate usw. kommen vom Original
+        return getattr(self.extractor, name)
+
+    @contextmanager
+    def scope(self, buffer_id, region, source=None):
+        """Ordnet die folgenden Aufrufe im aktuellen Thread einem Audio-Puffer zu.
+        source: ganzer Puffer, wenn region = ("segment", start, end) ein Ausschnitt daraus ist"""
+        previous = getattr(self.local, "scope", None), getattr(self.local, "source", None)
+        self.local.scope = (buffer_id, region)
+        self.local.source = source
+        try:
+            yield
+        finally:
+            self.local.scope, self.local.source = previous
+
+    def take_stats(self):
+        """Liefert und leert die Mel-Statistik des aktuellen Threads"""
+        stats = {
+            "mel_time": getattr(self.local, "mel_time", 0.0),
+            "mel_cache_hits": getattr(self.local, "hits", 0),
+        }
+        self.local.mel_time = 0.0
+        self.local.hits = 0
+        return stats
+
+    def clear(self, buffer_id=None):
+        """Verwirft alle Einträge (oder nur die eines Puffers)"""
+        with self.lock:
+            for key in [k for k in self.cache if buffer_id is None or k[0] == buffer_id]:
+                del self.cache[key]
+
+    def __call__(self, waveform, padding=True, chunk_length=None):
+        extractor = self.extractor
+        if chunk_length is not None:
+            extractor.n_samples = chunk_length * extractor.sampling_rate
+            extractor.nb_max_frames = extractor.n_samples // extractor.hop_length
+
+        key = None
+        scope = getattr(self.local, "scope", None)
+        source = getattr(self.local, "source", None)
+        if scope is not None and source is not None:
+            return self._slice_source(scope, source, len(waveform), padding)
+        if scope is not None:
+            key = scope + (len(waveform), padding, extractor.n_samples, extractor.mel_filters.shape[0])
+            with self.lock:
+                features = self.cache.get(key)
+                if features is not None:
+                    self.cache.move_to_end(key)
+            if features is not None:
+                self.local.hits = getattr(self.local, "hits", 0) + 1
+                return features
+
+        start = time.time()
+        features = log_mel_spectrogram(waveform, extractor, padding)
+        self.local.mel_time = getattr(self.local, "mel_time", 0.0) + time.time() - start
+
+        if key is not None:
+            self._store(key, features)
+        return features
+
+    def _store(self, key, features):
+        features.flags.writeable = False  # Wird von mehreren Dekodierungen geteilt
+        with self.lock:
+            self.cache[key] = features
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+
+    def _slice_source(self, scope, source, length, padding):
+        """Features eines Ausschnitts aus den Features des ganzen Puffers - wie Whisper bei
+        langem Audio: ein Mel für alles, Fenster werden daraus geschnitten.
+        Näherung: die Rand-Frames sehen echten Kontext statt Reflect-Padding, und Normierung
+        (Maximum - 8) sowie Stille-Boden folgen dem Maximum des ganzen Puffers, nicht des Ausschnitts"""
+        import numpy as np
+
+        extractor = self.extractor
+        buffer_id, (_, start, _) = scope
+        key = (buffer_id, ("full",), len(source), extractor.mel_filters.shape[0])
+        with self.lock:
+            full = self.cache.get(key)
+            if full is not None:
+                self.cache.move_to_end(key)
+        if full is not None:
+            self.local.hits = getattr(self.local, "hits", 0) + 1
+        else:
+            mel_start = time.time()
+            full = log_mel_spectrogram(source, extractor, padding=False)
+            self.local.mel_time = getattr(self.local, "mel_time", 0.0) + time.time() - mel_start
+            self._store(key, full)
+
+        first = start // extractor.hop_length
+        features = full[:, first:first + length // extractor.hop_length]
+        if padding:
+            # Angehängte Stille: Boden der Normierung (Maximum - 8 in log10 → -2) des ganzen Puffers
+            silence = np.full((full.shape[0], extractor.n_samples // extractor.hop_length),
+                              full.max() - 2.0, dtype=full.dtype)
+            features = np.concatenate([features, silence], axis=1)
+        return features
+
+class TranscriptionEngine:
+    """Kapselt das Whisper-Modell, die Dekodier-Strategien (Beam oder Zwei-Pass)
+    und die Spracherkennung im Auto-Modus (language="auto")"""
+
+    # Temperatur-Fallback wie in Whisper für schwache Segmente
+    FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+    def __init__(self, model, model_size, language="de", decode_mode="beam",
+                 redecode_logprob=-1.0, redecode_compression=2.4, sample_rate=16000):
+        self.model = model
+        self.model_size = model_size
+        self.language = language
+        self.decode_mode = decode_mode
+        self.sample_rate = sample_rate
+
+        # Schwellwerte für das erneute Dekodieren (entsprechen Whispers Fallback-Kriterien)
+        self.redecode_logprob = redecode_logprob
+        self.redecode_compression = redecode_compression
+        self.redecode_padding = 0.2  # Sekunden Kontext vor/nach dem Segment
+
+        self.vad_parameters = dict(min_silence_duration_ms=500)
+
+        # Auto-Sprache: einmal erkennen, dann pro Sitzung beibehalten ("sticky")
+        self.language_lock = threading.Lock()
+        self.detect_seconds = 8.0  # Nur die ersten Sekunden Sprache werden analysiert
+        self.sticky_threshold = 0.7  # Mindest-Wahrscheinlichkeit zum Cachen der Sprache
+        self.wrong_language_logprob = -1.0  # Schwächer → Sprachwechsel vermuten
+        self.sticky_language = None
+        self.sticky_probability = 0.0
+
+        # Hält ein Modellwechsel an, bis die laufende Transkription fertig ist
+        self.model_lock = threading.RLock()
+
+        # Mel-Features einmal pro Puffer berechnen, Neu-Dekodierungen nutzen den Cache
+        self.buffer_ids = itertools.count(1)
+        self.features = None
+        self.install_feature_cache()
+
+    def install_feature_cache(self):
+        """Hängt den Feature-Cache vor den FeatureExtractor des aktuellen Modells"""
+        extractor = getattr(self.model, "feature_extractor", None)
+        if extractor is None:
+            self.features = None
+        elif isinstance(extractor, CachedFeatureExtractor):
+            self.features = extractor
+        else:
+            self.features = CachedFeatureExtractor(extractor)
+            self.model.feature_extractor = self.features
+
+    def swap_model(self, model, model_size):
+        """Tauscht das Modell atomar aus (zwischen zwei Transkriptionen), gibt das alte zurück"""
+        with self.model_lock:
+            old_model = self.model
+            self.model = model
+            self.model_size = model_size
+            self.install_feature_cache()
+        return old_model
+
+    def _feature_scope(self, buffer_id, region, source=None):
+        """Cache-Kontext für einen Aufruf von model.transcribe() (ohne Cache: no-op)"""
+        if self.features is None or buffer_id is None:
+            return nullcontext()
+        return self.features.scope(buffer_id, region, source)
+
+    def transcribe(self, audio, buffer_id=None):
+        """Transkribiert Float32-Audio (16 kHz, mono) und gibt (Text, Metriken) zurück.
+        Gleiche buffer_id bei erneutem Aufruf → Mel-Features kommen aus dem Cache"""
+        with self.model_lock:
+            return self._transcribe(audio, buffer_id)
+
+    def _transcribe(self, audio, buffer_id):
+        if buffer_id is None:
+            buffer_id = next(self.buffer_ids)
+        if self.features is not None:
+            self.features.take_stats()
+
+        language, metrics = self.resolve_language(audio, buffer_id)
+        text, decode_metrics = self._decode(audio, language, buffer_id)
+        metrics.update(decode_metrics)
+
+        # Gecachte Sprache liefert schwaches Ergebnis → evtl. Sprachwechsel des Nutzers
+        if (metrics["language_source"] == "cache"
+                and metrics.get("avg_logprob", 0.0) < self.wrong_language_logprob):
+            detected, probability, detect_time = self.detect_language(audio, buffer_id)
+            metrics["detect_time"] = detect_time
+            if detected != language and probability >= self.sticky_threshold:
+                logger.info(f"🌐 Sprachwechsel erkannt: {language} → {detected} ({probability:.2f}) - dekodiere neu")
+                self._remember_language(detected, probability)
+                text, decode_metrics = self._decode(audio, detected, buffer_id)
+                metrics.update(decode_metrics)
+                metrics.update(language=detected, language_probability=probability,
+                               language_source="redetected")
+
+        if self.features is not None:
+            metrics.update(self.features.take_stats())
+        metrics["model"] = self.model_size
+        return text, metrics
+
+    def _decode(self, audio, language, buffer_id=None):
+        """Wählt den Dekodier-Modus"""
+        if self.decode_mode == "two-pass":
+            return self._transcribe_two_pass(audio, language, buffer_id)
+        return self._transcribe_beam(audio, language, buffer_id)
+
+    def resolve_language(self, audio, buffer_id=None):
+        """Bestimmt die Sprache für eine Aufnahme (fest, aus dem Cache oder per Erkennung)"""
+        if self.language != "auto":
+            return self.language, {"language": self.language, "language_source": "fixed"}
+
+        with self.language_lock:
+            if self.sticky_language:
+                return self.sticky_language, {
+                    "language": self.sticky_language,
+                    "language_probability": self.sticky_probability,
+                    "language_source": "cache",
+                }
+
+        language, probability, detect_time = self.detect_language(audio, buffer_id)
+        self._remember_language(language, probability)
+        return language, {
+            "language": language,
+            "language_probability": probability,
+            "language_source": "detected",
+            "detect_time": detect_time,
+        }
+
+    def detect_language(self, audio, buffer_id=None):
+        """Erkennt die Sprache anhand der ersten Sekunden Sprache (ohne Dekodierung)"""
+        start = time.time()
+        probe = self._language_probe(audio)
+
+        # transcribe() erkennt die Sprache sofort, die Segmente werden nur lazy dekodiert
+        with self._feature_scope(buffer_id, ("probe",)):
+            _, info = self.model.transcribe(probe, language=None, beam_size=1, vad_filter=False)
+        detect_time = time.time() - start
+
+        logger.info(f"🌐 Sprache erkannt: {info.language} ({info.language_probability:.2f}) in {detect_time*1000:.0f}ms")
+        return info.language, info.language_probability, detect_time
+
+    def _language_probe(self, audio):
+        """Schneidet führende Stille ab und begrenzt auf detect_seconds"""
+        import numpy as np
+        frame = int(0.02 * self.sample_rate)
+        offset = 0
+        usable = len(audio) - len(audio) % frame
+        if usable:
+            rms = np.sqrt(np.mean(np.square(audio[:usable].reshape(-1, frame)), axis=1))
+            voiced = np.nonzero(rms > 0.01)[0]
+            if len(voiced):
+                offset = int(voiced[0]) * frame
+        return audio[offset:offset + int(self.detect_seconds * self.sample_rate)]
+
+    def _remember_language(self, language, probability):
+        """Speichert eine sichere Erkennung als Sitzungssprache"""
+        with self.language_lock:
+            if probability >= self.sticky_threshold:
+                self.sticky_language = language
+                self.sticky_probability = probability
+            else:
+                logger.debug(f"Spracherkennung unsicher ({language}, {probability:.2f}) - nicht gecacht")
+
+    def _transcribe_beam(self, audio, language, buffer_id=None):
+        """Ein Durchlauf mit Beam-Search (bisheriges Verhalten)"""
+        logger.debug("Rufe transcribe() auf (Beam 5)...")
+        with self._feature_scope(buffer_id, ("vad",)):
+            segments, info = self.model.transcribe(
+                audio,
+                language=language,
+                beam_size=5,
+                best_of=5,
+                temperature=0.0,
+                vad_filter=True,  # Voice Activity Detection
+                vad_parameters=self.vad_parameters
+            )
+        logger.info(f"Transkription erfolgreich - Sprachinformation: {info}")
+
+        segment_texts = []
+        logprobs = []
+        for segment in segments:
+            if hasattr(segment, 'text') and segment.text.strip():
+                segment_texts.append(segment.text.strip())
+                logprobs.append(segment.avg_logprob)
+                logger.debug(f"Segment: {segment.text}")
+
+        metrics = {"decode_mode": "beam", "segments": len(segment_texts)}
+        if logprobs:
+            metrics["avg_logprob"] = sum(logprobs) / len(logprobs)
+        return " ".join(segment_texts).strip(), metrics
+
+    def _transcribe_two_pass(self, audio, language, buffer_id=None):
+        """Greedy-Durchlauf, nur schwache Segmente werden mit Beam 5 neu dekodiert"""
+        logger.debug("Rufe transcribe() auf (Zwei-Pass, Greedy)...")
+        first_pass_start = time.time()
+        with self._feature_scope(buffer_id, ("vad",)):
+            segments, info = self.model.transcribe(
+                audio,
+                language=language,
+                beam_size=1,
+                best_of=1,
+                temperature=0.0,
+                vad_filter=True,
+                vad_parameters=self.vad_parameters
+            )
+        logger.info(f"Transkription erfolgreich - Sprachinformation: {info}")
+
+        segment_texts = []
+        kept_segments = []
+        weak_segments = []
+        logprobs = []
+        for segment in segments:
+            text = segment.text.strip()
+            if not text:
+                continue
+            logprobs.append(segment.avg_logprob)
+            logger.debug(f"Segment (Greedy): {segment.text} "
+                         f"[logprob={segment.avg_logprob:.2f}, ratio={segment.compression_ratio:.2f}]")
+            if self._is_weak_segment(segment):
+                weak_segments.append((len(segment_texts), segment))
+            segment_texts.append(text)
+            kept_segments.append(segment)
+        first_pass_time = time.time() - first_pass_start
+
+        # Zweiter Durchlauf nur für schwache Segmente, Ergebnis wird an der Stelle eingesetzt
+        second_pass_start = time.time()
+        replaced = 0
+        for index, segment in weak_segments:
+            # Fenster an den Nachbarsegmenten begrenzen, sonst landen deren Wörter doppelt im Text
+            lower = kept_segments[index - 1].end if index > 0 else None
+            upper = kept_segments[index + 1].start if index + 1 < len(kept_segments) else None
+            redecoded = self._redecode_segment(audio, segment, language, buffer_id, (lower, upper))
+            if redecoded:
+                segment_texts[index] = redecoded
+                replaced += 1
+        second_pass_time = time.time() - second_pass_start
+
+        logger.info(f"Zwei-Pass: {len(weak_segments)}/{len(segment_texts)} Segmente neu dekodiert, "
+                    f"{replaced} ersetzt (Greedy {first_pass_time:.2f}s, Beam {second_pass_time:.2f}s)")
+
+        metrics = {
+            "decode_mode": "two-pass",
+            "segments": len(segment_texts),
+            "redecoded": len(weak_segments),
+            "replaced": replaced,
+            "first_pass_time": first_pass_time,
+            "second_pass_time": second_pass_time,
+        }
+        if logprobs:
+            metrics["avg_logprob"] = sum(logprobs) / len(logprobs)
+        return " ".join(segment_texts).strip(), metrics
+
+    def _is_weak_segment(self, segment):
+        """Prüft ob ein Greedy-Segment unsicher ist (niedrige Logprob oder Wiederholungen)"""
+        return (segment.avg_logprob < self.redecode_logprob
+                or segment.compression_ratio > self.redecode_compression)
+
+    def _redecode_segment(self, audio, segment, language, buffer_id=None, bounds=(None, None)):
+        """Dekodiert einen Audio-Ausschnitt mit Beam 5 und Temperatur-Fallback neu
+
+        bounds: (Ende des vorherigen, Start des nächsten Segments) in Sekunden;
+        die Polsterung reicht nie über diese Grenzen hinaus.
+        """
+        lower, upper = bounds
+        window_start = segment.start - self.redecode_padding
+        window_end = segment.end + self.redecode_padding
+        if lower is not None:
+            window_start = max(window_start, min(lower, segment.start))
+        if upper is not None:
+            window_end = min(window_end, max(upper, segment.end))
+        start = max(0, int(window_start * self.sample_rate))
+        end = min(len(audio), int(window_end * self.sample_rate))
+        if self.features is not None:
+            # Auf Frame-Raster legen, damit die Frames des ganzen Puffers zeitlich passen
+            start -= start % self.features.hop_length
+        if end <= start:
+            return None
+
+        try:
+            with self._feature_scope(buffer_id, ("segment", start, end), source=audio):
+                segments, _ = self.model.transcribe(
+                    audio[start:end],
+                    language=language,
+                    beam_size=5,
+                    best_of=5,
+                    temperature=self.FALLBACK_TEMPERATURES,
+                    condition_on_previous_text=False,
+                    without_timestamps=True
+                )
+                segments = [s for s in segments if s.text.strip()]
+        except Exception as e:
+            logger.warning(f"Neu-Dekodierung von Segment {segment.start:.1f}-{segment.end:.1f}s fehlgeschlagen: {e}")
+            return None
+
+        if not segments:
+            return None
+
+        # Nur übernehmen, wenn der Beam-Durchlauf mindestens so sicher ist wie Greedy
+        avg_logprob = sum(s.avg_logprob for s in segments) / len(segments)
+        if avg_logprob < segment.avg_logprob:
+            logger.debug(f"Neu-Dekodierung verworfen ({avg_logprob:.2f} < {segment.avg_logprob:.2f})")
+            return None
+
+        text = " ".join(s.text.strip() for s in segments)
+        logger.debug(f"Segment neu dekodiert: '{segment.text.strip()}' → '{text}'")
+        return text
+
+class OutputSink:
+    """Basisklasse für Ausgabeziele des Output-Workers"""
+    name = "sink"
+    depends_on = None  # Name eines Sinks, der vorher erfolgreich sein muss
+
+    def deliver(self, job):
+        """Gibt den Text eines Jobs aus, gibt optional Zusatz-Metriken zurück"""
+        raise NotImplementedError
+
+    def close(self):
+        """Gibt Ressourcen frei (Dateien, Sockets)"""
+        pass
+
+class ClipboardSink(OutputSink):
+    """Kopiert den Text in die Zwischenablage"""
+    name = "clipboard"
+
+    def deliver(self, job):
+        import pyperclip
+        pyperclip.copy(job["text"])
+        logger.info("✅ Text in Zwischenablage kopiert")
+
+class PasteSink(OutputSink):
+    """Fügt den Text per STRG+V ein - mit adaptiver statt fester Wartezeit"""
+    name = "paste"
+    depends_on = "clipboard"
+
+    def __init__(self, focus_delay=0.2, clipboard_timeout=0.2, modifier_timeout=0.5):
+        # Fokus-Wartezeit zählt ab dem Stop-Hotkey, ist nach der Dekodierung meist schon vorbei
+        self.focus_delay = focus_delay
+        self.clipboard_timeout = clipboard_timeout
+        self.modifier_timeout = modifier_timeout
+
+    def deliver(self, job):
+        import pyperclip
+        kb = get_keyboard()
+        wait_start = time.time()
+
+        remaining = self.focus_delay - (wait_start - job.get("stop_time", 0.0))
+        if remaining > 0:
+            time.sleep(remaining)
+
+        # Warten bis die Zwischenablage den neuen Text liefert (statt blind zu schlafen)
+        deadline = time.time() + self.clipboard_timeout
+        while time.time() < deadline:
+            try:
+                if pyperclip.paste() == job["text"]:
+                    break
+            except Exception:
+                break
+            time.sleep(0.01)
+
+        # Noch gedrückte SHIFT/ALT (z.B. vom Hotkey STRG+SHIFT+R) machen aus STRG+V ein STRG+SHIFT+V
+        # bzw. STRG+ALT+V; ein noch gehaltenes STRG stört nicht, es wird für STRG+V ohnehin gedrückt
+        if kb:
+            deadline = time.time() + self.modifier_timeout
+            while time.time() < deadline and any(kb.is_pressed(k) for k in ('shift', 'alt')):
+                time.sleep(0.01)
+
+        paste_wait = time.time() - wait_start
+
+        # Methode 1: Mit keyboard library (wenn verfügbar)
+        if kb:
+            logger.info("Verwende keyboard library für Auto-Paste")
+            kb.press_and_release('ctrl+v')
+            logger.info("✅ Auto-Paste erfolgreich (keyboard library)")
+        else:
+            # Methode 2: Mit pyautogui
+            logger.info("Verwende pyautogui für Auto-Paste")
+            get_pyautogui().hotkey('ctrl', 'v')
+            logger.info("✅ Auto-Paste erfolgreich (pyautogui)")
+
+        return {"paste_wait": paste_wait}
+
+class FileSink(OutputSink):
+    """Hängt jedes Ergebnis mit Zeitstempel an eine Textdatei an"""
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+        logger.info(f"Ausgabe-Datei: {path}")
+
+    def deliver(self, job):
+        timestamp = datetime.fromtimestamp(job["submitted"]).strftime('%Y-%m-%d %H:%M:%S')
+        self.file.write(f"[{timestamp}] {job['text']}\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class StdoutSink(OutputSink):
+    """Schreibt das Ergebnis auf stdout (für Pipes und Skripte)"""
+    name = "stdout"
+
+    def deliver(self, job):
+        sys.stdout.write(job["text"] + "\n")
+        sys.stdout.flush()
+
+class SocketSink(OutputSink):
+    """Sendet jedes Ergebnis als UTF-8-Zeile an einen lokalen TCP-Port"""
+    name = "socket"
+
+    def __init__(self, host="127.0.0.1", port=50555, timeout=1.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.sock = None
+
+    def deliver(self, job):
+        data = (job["text"] + "\n").encode('utf-8')
+        # Verbindung wiederverwenden, bei Fehler einmal neu verbinden
+        for attempt in range(2):
+            if self.sock is None:
+                self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            try:
+                self.sock.sendall(data)
+                return
+            except OSError:
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self):
+        if self.sock:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+class MemorySink(OutputSink):
+    """Ersatz für Zwischenablage/Auto-Paste im Replay-Modus: merkt sich jede Ausgabe mit Zeitpunkt"""
+
+    def __init__(self, name, depends_on=None):
+        self.name = name
+        self.depends_on = depends_on
+        self.deliveries = []  # (Zeitpunkt, Job)
+        self.delivered = threading.Condition()
+
+    def deliver(self, job):
+        with self.delivered:
+            self.deliveries.append((time.time(), job))
+            self.delivered.notify_all()
+
+    def wait_for(self, count, timeout=None):
+        """Wartet bis mindestens count Ausgaben angekommen sind"""
+        with self.delivered:
+            return self.delivered.wait_for(lambda: len(self.deliveries) >= count, timeout)
+
+def create_output_sinks(names, output_file=None, output_socket=None):
+    """Erzeugt die Ausgabe-Sinks aus einer Komma-Liste (z.B. "clipboard,paste")"""
+    sinks = []
+    for name in [n.strip() for n in names.split(',') if n.strip()]:
+        if name == "clipboard":
+            sinks.append(ClipboardSink())
+        elif name == "paste":
+            if get_pyautogui():
+                sinks.append(PasteSink())
+            else:
+                logger.info("pyautogui nicht verfügbar - nur Zwischenablage")
+        elif name == "file":
+            sinks.append(FileSink(output_file or os.path.join(
+                os.path.dirname(os.path.abspath(__file__)), "transkripte.txt")))
+        elif name == "stdout":
+            sinks.append(StdoutSink())
+        elif name == "socket":
+            host, _, port = (output_socket or "127.0.0.1:50555").rpartition(':')
+            sinks.append(SocketSink(host or "127.0.0.1", int(port)))
+        else:
+            raise ValueError(f"Unbekanntes Ausgabeziel: {name}")
+    return sinks
+
+class OutputDispatcher:
+    """Liefert Ergebnisse in Reihenfolge über einen eigenen Worker-Thread an die Sinks aus,
+    damit der Verarbeitungs-Thread sofort den nächsten Job annehmen kann"""
+
+    def __init__(self, sinks, on_delivered=None):
+        self.sinks = sinks
+        self.on_delivered = on_delivered
+        self.queue = queue.Queue()
+        self.job_counter = 0
+        self.worker = threading.Thread(target=self._run, name="Output-Worker", daemon=True)
+        self.worker.start()
+        logger.info(f"Ausgabe-Ziele: {', '.join(s.name for s in sinks) or 'keine'}")
+
+    def submit(self, text, metrics=None, stop_time=0.0):
+        """Stellt ein Ergebnis zur Ausgabe ein (nicht blockierend)"""
+        self.job_counter += 1
+        job = {
+            "id": self.job_counter,
+            "text": text,
+            "metrics": metrics or {},
+            "stop_time": stop_time,
+            "submitted": time.time(),
+        }
+        self.queue.put(job)
+        return job["id"]
+
+    def _run(self):
+        """Worker-Loop: ein Job nach dem anderen, Sinks in konfigurierter Reihenfolge"""
+        while True:
+            job = self.queue.get()
+            if job is None:
+                break
+
+            timings = {}
+            errors = {}
+            queue_wait = time.time() - job["submitted"]
+            for sink in self.sinks:
+                if sink.depends_on and (sink.depends_on in errors
+                                        or sink.depends_on not in timings):
+                    logger.debug(f"Sink '{sink.name}' übersprungen ('{sink.depends_on}' nicht erfolgreich)")
+                    continue
+                start = time.time()
+                try:
+                    extra = sink.deliver(job)
+                    timings[sink.name] = time.time() - start
+                    if extra:
+                        job["metrics"].update(extra)
+                except Exception as e:
+                    errors[sink.name] = e
+                    logger.warning(f"Ausgabe über '{sink.name}' fehlgeschlagen: {e}", exc_info=True)
+
+            timing_text = ", ".join(f"{name}={t*1000:.0f}ms" for name, t in timings.items())
+            logger.info(f"Ausgabe #{job['id']}: Warteschlange {queue_wait*1000:.0f}ms, {timing_text or 'keine Sinks'}")
+            job["metrics"]["output_timings"] = timings
+
+            if self.on_delivered:
+                try:
+                    self.on_delivered(job, timings, errors)
+                except Exception as e:
+                    logger.warning(f"Fehler im Ausgabe-Callback: {e}", exc_info=True)
+
+    def close(self, timeout=2.0):
+        """Liefert ausstehende Jobs noch aus und beendet den Worker"""
+        self.queue.put(None)
+        self.worker.join(timeout)
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.debug(f"Fehler beim Schließen von Sink '{sink.name}': {e}")
+
+class PycawVolumeBackend:
+    """Lautstärke einzelner Audio-Sessions über die Windows Audio API (pycaw)"""
+
+    name = "pycaw"
+
+    def __init__(self):
+        self.pycaw = get_pycaw()
+
+    def available(self):
+        return self.pycaw is not None
+
+    def thread_init(self):
+        """COM muss in jedem Thread initialisiert werden, der Sessions anspricht"""
+        import comtypes
+        comtypes.CoInitialize()
+
+    def thread_exit(self):
+        import comtypes
+        comtypes.CoUninitialize()
+
+    def sessions(self, process_names):
+        """Gibt {(Prozessname, PID): Volume-Interface} für die gesuchten Prozesse zurück"""
+        found = {}
+        for session in self.pycaw.AudioUtilities.GetAllSessions():
+            if session.Process:
+                process_name = session.Process.name().lower()
+                if process_name in process_names:
+                    found[(process_name, session.ProcessId)] = session._ctl.QueryInterface(
+                        self.pycaw.ISimpleAudioVolume)
+        return found
+
+    def get_volume(self, handle):
+        return handle.GetMasterVolume()
+
+    def set_volume(self, handle, volume):
+        handle.SetMasterVolume(volume, None)
+
+class MockVolumeBackend:
+    """Simulierte Audio-Sessions zum Testen ohne Windows (--duck-backend mock)"""
+
+    name = "mock"
+
+    def __init__(self, sessions=None):
+        self.volumes = dict(sessions or {})  # {(Prozessname, PID): Lautstärke}
+        self.lock = threading.Lock()
+        self.set_calls = 0
+        self.enumerations = 0
+
+    def available(self):
+        return True
+
+    def thread_init(self):
+        pass
+
+    def thread_exit(self):
+        pass
+
+    def add_session(self, process_name, volume=1.0, pid=None):
+        """Simuliert einen Player, der (später) gestartet wird"""
+        with self.lock:
+            key = (process_name.lower(), pid if pid is not None else len(self.volumes) + 1000)
+            self.volumes[key] = volume
+            return key
+
+    def remove_session(self, key):
+        with self.lock:
+            self.volumes.pop(key, None)
+
+    def sessions(self, process_names):
+        with self.lock:
+            self.enumerations += 1
+            return {key: key for key in self.volumes if key[0] in process_names}
+
+    def get_volume(self, handle):
+        with self.lock:
+            if handle not in self.volumes:
+                raise OSError(f"Session {handle} existiert nicht mehr")
+            return self.volumes[handle]
+
+    def set_volume(self, handle, volume):
+        with self.lock:
+            if handle not in self.volumes:
+                raise OSError(f"Session {handle} existiert nicht mehr")
+            self.volumes[handle] = volume
+            self.set_calls += 1
+
+def create_volume_backend(name="auto"):
+    """auto: pycaw falls installiert, mock: simulierte Sessions, off: kein Ducking"""
+    if name == "off":
+        return None
+    if name == "mock":
+        return MockVolumeBackend()
+    backend = PycawVolumeBackend()
+    return backend if backend.available() else None
+
+class DuckingService:
+    """Senkt die Lautstärke von Musik-Playern während der Aufnahme ab.
+    Ein dauerhafter Scheduler-Thread erledigt alles (Session-Suche, Absenken, Fade-In),
+    duck()/restore() stellen nur einen Befehl in die Warteschlange."""
+
+    DEFAULT_PLAYERS = ("aimp.exe", "aimp32.exe", "aimp64.exe")
+
+    def __init__(self, backend, players=DEFAULT_PLAYERS, duck_level=0.07,
+                 fade_duration=1.0, fade_steps=20, refresh_interval=10.0):
+        self.backend = backend
+        self.players = tuple(p.strip().lower() for p in players if p.strip())
+        self.duck_level = duck_level  # Reduziere auf 7% während Aufnahme
+        self.fade_duration = fade_duration
+        self.step_interval = fade_duration / fade_steps
+        self.refresh_interval = refresh_interval  # Sekunden bis der Session-Index neu aufgebaut wird
+
+        self.index = {}  # {(Prozessname, PID): Handle}, nur im Scheduler-Thread benutzt
+        self.index_time = 0.0
+        self.originals = {}  # Lautstärke vor dem Absenken pro Session
+        self.fades = {}  # Laufende Fade-Ins: {Session: (Startlautstärke, Startzeit)}
+
+        self.commands = queue.Queue()
+        self.thread = None
+        if backend is not None:
+            self.thread = threading.Thread(target=self._run, name="Ducking-Scheduler", daemon=True)
+            self.thread.start()
+        else:
+            logger.debug("Kein Lautstärke-Backend - Ducking deaktiviert")
+
+    def duck(self):
+        """Lautstärke absenken (kehrt sofort zurück)"""
+        if self.thread:
+            self.commands.put(("duck", None))
+
+    def restore(self):
+        """Lautstärke per Fade-In wiederherstellen (kehrt sofort zurück)"""
+        if self.thread:
+            self.commands.put(("restore", None))
+
+    def wait_idle(self, timeout=None):
+        """Wartet, bis alle bisherigen Befehle verarbeitet sind (nicht auf laufende Fades)"""
+        if not self.thread:
+            return True
+        done = threading.Event()
+        self.commands.put(("sync", done))
+        return done.wait(timeout)
+
+    def close(self, timeout=2.0):
+        """Stellt sofort (ohne Fade) wieder her und beendet den Scheduler"""
+        if self.thread:
+            self.commands.put(("stop", None))
+            self.thread.join(timeout)
+            self.thread = None
+
+    def _run(self):
+        try:
+            self.backend.thread_init()
+        except Exception as e:
+            logger.warning(f"Ducking: COM-Initialisierung fehlgeschlagen: {e}")
+            return
+
+        try:
+            self._refresh_index()
+            while True:
+                try:
+                    command, argument = self.commands.get(timeout=self.step_interval if self.fades else None)
+                except queue.Empty:
+                    command = None
+
+                if command == "stop":
+                    self._restore_immediately()
+                    break
+                elif command == "duck":
+                    self._duck()
+                elif command == "restore":
+                    self._start_fades()
+                elif command == "sync":
+                    argument.set()
+
+                self._advance_fades()
+        except Exception as e:
+            logger.critical(f"Fehler im Ducking-Scheduler: {e}", exc_info=True)
+        finally:
+            self.backend.thread_exit()
+
+    def _refresh_index(self):
+        """Sessions neu aufzählen (beim Start und wenn der Index veraltet ist)"""
+        start = time.time()
+        try:
+            self.index = self.backend.sessions(self.players)
+        except Exception as e:
+            logger.warning(f"⚠️ Ducking: Fehler beim Suchen der Audio-Sessions: {e}")
+            self.index = {}
+        self.index_time = time.time()
+
+        if self.index:
+            names = ", ".join(sorted({name for name, _ in self.index}))
+            logger.info(f"✅ Ducking: {len(self.index)} Session(s) gefunden ({names}) "
+                        f"in {(self.index_time - start)*1000:.0f}ms")
+        else:
+            logger.info(f"ℹ️ Ducking: kein Player aktiv ({', '.join(self.players)})")
+
+    def _drop_session(self, key, error):
+        """Session ist verschwunden (Player beendet) → beim nächsten Mal neu suchen"""
+        logger.debug(f"Ducking: Session {key} entfernt ({error})")
+        self.index.pop(key, None)
+        self.originals.pop(key, None)
+        self.fades.pop(key, None)
+        self.index_time = 0.0
+
+    def _duck(self):
+        if time.time() - self.index_time > self.refresh_interval:
+            self._refresh_index()
+
+        for key, handle in list(self.index.items()):
+            try:
+                if key in self.fades:
+                    # Fade-In läuft noch → abbrechen, Ursprungslautstärke bleibt die gemerkte
+                    del self.fades[key]
+                elif key not in self.originals:
+                    self.originals[key] = self.backend.get_volume(handle)
+                target = min(self.duck_level, self.originals[key])
+                self.backend.set_volume(handle, target)
+                logger.info(f"🔉 {key[0]} Lautstärke reduziert: {self.originals[key]*100:.0f}% → {target*100:.0f}%")
+            except Exception as e:
+                self._drop_session(key, e)
+
+    def _start_fades(self):
+        now = time.time()
+        for key in self.originals:
+            if key not in self.fades:
+                self.fades[key] = (min(self.duck_level, self.originals[key]), now)
+
+    def _advance_fades(self):
+        """Einen Fade-Schritt für alle laufenden Fade-Ins setzen"""
+        now = time.time()
+        for key, (start_volume, start_time) in list(self.fades.items()):
+            target = self.originals[key]
+            progress = min(1.0, (now - start_time) / self.fade_duration)
+            try:
+                self.backend.set_volume(self.index[key], start_volume + (target - start_volume) * progress)
+            except Exception as e:
+                self._drop_session(key, e)
+                continue
+            if progress >= 1.0:
+                logger.info(f"✅ {key[0]} Lautstärke wiederhergestellt: {target*100:.0f}%")
+                del self.fades[key]
+                del self.originals[key]
+
+    def _restore_immediately(self):
+        for key, volume in list(self.originals.items()):
+            try:
+                self.backend.set_volume(self.index[key], volume)
+                logger.info(f"🔊 {key[0]} Lautstärke direkt wiederhergestellt: {volume*100:.0f}%")
+            except Exception as e:
+                logger.warning(f"Fehler beim Wiederherstellen der Lautstärke von {key[0]}: {e}")
+        self.originals.clear()
+        self.fades.clear()
+
+class TranscriptHistory:
+    """Lokaler Verlauf aller Transkripte (SQLite, Volltextsuche über FTS5).
+    Schreiben läuft über einen Hintergrund-Thread, process_audio() wartet nie auf die Datenbank."""
+
+    def __init__(self, path, store_audio=False):
+        import sqlite3
+
+        self.path = path
+        self.store_audio = store_audio
+        self.queue = queue.Queue()
+
+        # Schema anlegen (FTS5 fehlt in manchen SQLite-Builds → LIKE-Suche als Fallback)
+        with sqlite3.connect(path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    id INTEGER PRIMARY KEY,
+                    created REAL NOT NULL,
+                    text TEXT NOT NULL,
+                    model TEXT,
+                    language TEXT,
+                    audio_duration REAL,
+                    processing_time REAL,
+                    metrics TEXT,
+                    audio BLOB,
+                    sample_rate INTEGER
+                )""")
+            try:
+                connection.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts
+                    USING fts5(text, content='transcripts', content_rowid='id')""")
+                connection.execute("""
+                    CREATE TRIGGER IF NOT EXISTS transcripts_ai AFTER INSERT ON transcripts BEGIN
+                        INSERT INTO transcripts_fts(rowid, text) VALUES (new.id, new.text);
+                    END""")
+                self.fts = True
+            except sqlite3.OperationalError as e:
+                logger.info(f"FTS5 nicht verfügbar ({e}) - Verlauf nutzt LIKE-Suche")
+                self.fts = False
+
+        self.writer = threading.Thread(target=self._run, name="History-Writer", daemon=True)
+        self.writer.start()
+        logger.info(f"📚 Verlauf: {path}{' (mit Audio)' if store_audio else ''}")
+
+    def add(self, text, metrics=None, audio_bytes=None, sample_rate=16000):
+        """Speichert ein Transkript (nicht blockierend)"""
+        metrics = metrics or {}
+        self.queue.put((
+            time.time(),
+            text,
+            metrics.get("model"),
+            metrics.get("language"),
+            metrics.get("audio_duration"),
+            metrics.get("processing_time"),
+            json.dumps({k: v for k, v in metrics.items() if isinstance(v, (int, float, str))}),
+            audio_bytes if self.store_audio else None,
+            sample_rate if self.store_audio and audio_bytes else None,
+        ))
+
+    def _run(self):
+        """Writer-Loop mit eigener Verbindung; mehrere wartende Einträge in einer Transaktion"""
+        import sqlite3
+
+        connection = sqlite3.connect(self.path)
+        try:
+            while True:
+                rows = [self.queue.get()]
+                while True:
+                    try:
+                        rows.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = None in rows
+                rows = [row for row in rows if row is not None]
+                flush_events = [row for row in rows if isinstance(row, threading.Event)]
+                rows = [row for row in rows if not isinstance(row, threading.Event)]
+                if rows:
+                    try:
+                        with connection:
+                            connection.executemany(
+                                "INSERT INTO transcripts (created, text, model, language, audio_duration, "
+                                "processing_time, metrics, audio, sample_rate) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                rows)
+                        logger.debug(f"Verlauf: {len(rows)} Eintrag/Einträge gespeichert")
+                    except sqlite3.Error as e:
+                        logger.warning(f"Fehler beim Schreiben des Verlaufs: {e}")
+                for event in flush_events:
+                    event.set()
+                if stop:
+                    break
+        finally:
+            connection.close()
+
+    def flush(self, timeout=2.0):
+        """Wartet, bis alle bisher eingestellten Einträge geschrieben sind"""
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=2.0):
+        self.queue.put(None)
+        self.writer.join(timeout)
+
+    def search(self, query="", limit=20):
+        """Sucht im Verlauf (leere Suche: neueste Einträge), gibt Liste von Dicts zurück"""
+        import sqlite3
+
+        columns = "t.id, t.created, t.text, t.model, t.audio_duration, t.processing_time"
+        words = query.split()
+        with sqlite3.connect(self.path) as connection:
+            connection.row_factory = sqlite3.Row
+            if not words:
+                rows = connection.execute(
+                    f"SELECT {columns} FROM transcripts t ORDER BY t.id DESC LIMIT ?", (limit,))
+            elif self.fts:
+                # Jedes Wort als Präfix-Phrase quoten → Sonderzeichen brechen die FTS-Syntax nicht
+                match = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+                rows = connection.execute(
+                    f"SELECT {columns} FROM transcripts_fts f JOIN transcripts t ON t.id = f.rowid "
+                    f"WHERE transcripts_fts MATCH ? ORDER BY rank LIMIT ?", (match, limit))
+            else:
+                conditions = " AND ".join("t.text LIKE ?" for _ in words)
+                rows = connection.execute(
+                    f"SELECT {columns} FROM transcripts t WHERE {conditions} ORDER BY t.id DESC LIMIT ?",
+                    [f"%{word}%" for word in words] + [limit])
+            return [dict(row) for row in rows]
+
+    def get(self, entry_id):
+        """Einzelner Eintrag (inkl. Audio, falls gespeichert) oder None"""
+        import sqlite3
+
+        with sqlite3.connect(self.path) as connection:
+            connection.row_factory = sqlite3.Row
+            row = connection.execute("SELECT * FROM transcripts WHERE id = ?", (entry_id,)).fetchone()
+            return dict(row) if row else None
+
+def format_history_entry(entry):
+    """Eine Zeile für CLI-Ausgabe und Suchfenster"""
+    created = datetime.fromtimestamp(entry["created"]).strftime("%d.%m. %H:%M")
+    return f"#{entry['id']}  {created}  {entry['text']}"
+
+# Audio-Import: beliebige Dateien blockweise dekodieren und auf 16 kHz mono bringen
+AUDIO_FILE_EXTENSIONS = ('.wav', '.flac', '.mp3', '.ogg', '.oga', '.opus', '.m4a')
+
+def iter_audio_file(path, block_seconds=30.0, sample_rate=16000):
+    """Dekodiert eine Audiodatei als Generator fester Blöcke (Float32, mono, sample_rate).
+    Es liegt nie die ganze Datei im Speicher, auch nicht bei mehrstündigen Aufnahmen"""
+    block_size = int(block_seconds * sample_rate)
+
+    if path.lower().endswith('.wav'):
+        try:
+            with wave.open(path, 'rb') as wf:
+                # Schneller Weg ohne Resampling: 16 kHz WAV mit 8/16/32 Bit
+                if wf.getframerate() == sample_rate and wf.getsampwidth() in (1, 2, 4):
+                    yield from _iter_wav_blocks(wf, block_size)
+                    return
+        except wave.Error as e:
+            logger.debug(f"WAV nicht direkt lesbar ({e}) - verwende PyAV")
+
+    yield from _rebuffer(_iter_av_chunks(path, sample_rate), block_size)
+
+def _iter_wav_blocks(wf, block_size):
+    """Liest PCM-Blöcke aus einer WAV-Datei und mischt auf mono herunter"""
+    import numpy as np
+
+    channels = wf.getnchannels()
+    sampwidth = wf.getsampwidth()
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[sampwidth]
+    scale = float(2 ** (8 * sampwidth - 1))
+
+    while True:
+        data = wf.readframes(block_size)
+        if not data:
+            break
+        samples = np.frombuffer(data, dtype=dtype).astype(np.float32)
+        if sampwidth == 1:
+            samples -= 128.0  # 8-Bit WAV ist vorzeichenlos
+        samples /= scale
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        yield samples
+
+def _iter_av_chunks(path, sample_rate):
+    """Dekodiert FLAC/MP3/OGG/... über PyAV (kommt mit faster-whisper) inkl. Resampling"""
+    import numpy as np
+
+    av = lazy_import("av")
+    if av is None:
+        raise RuntimeError("PyAV nicht installiert - nur 16 kHz WAV-Dateien lesbar")
+
+    resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+
+    def resample(frame):
+        if frame is not None:
+            frame.pts = None  # Zeitstempel-Prüfung des Resamplers umgehen
+        for resampled in resampler.resample(frame):
+            yield resampled.to_ndarray().reshape(-1).astype(np.float32) / 32768.0
+
+    # Paketweise dekodieren: ein defektes Paket kostet nur dieses Paket, nicht den Rest der Datei
+    skipped = 0
+    with av.open(path, mode="r", metadata_errors="ignore") as container:
+        for packet in container.demux(audio=0):
+            try:
+                frames = packet.decode()
+            except av.error.InvalidDataError:
+                skipped += 1
+                continue
+            for frame in frames:
+                yield from resample(frame)
+        yield from resample(None)  # None leert den Resampler
+
+    if skipped:
+        logger.warning(f"⚠️ {os.path.basename(path)}: {skipped} defekte Pakete übersprungen")
+
+def _rebuffer(chunks, block_size):
+    """Fasst Stücke beliebiger Länge zu Blöcken fester Größe zusammen"""
+    import numpy as np
+
+    pending = []
+    pending_len = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_len += len(chunk)
+        if pending_len < block_size:
+            continue
+        data = np.concatenate(pending)
+        while len(data) >= block_size:
+            yield data[:block_size]
+            data = data[block_size:]
+        pending = [data]
+        pending_len = len(data)
+
+    if pending_len:
+        yield np.concatenate(pending)
+
+def find_quiet_cut(audio, search_start, sample_rate=16000, frame_seconds=0.02):
+    """Sucht ab search_start den leisesten Punkt (für Schnitte möglichst zwischen Wörtern)"""
+    import numpy as np
+
+    frame = int(frame_seconds * sample_rate)
+    region = audio[search_start:]
+    usable = len(region) - len(region) % frame
+    if usable < frame:
+        return len(audio)
+    energy = np.mean(np.square(region[:usable].reshape(-1, frame)), axis=1)
+    return search_start + int(np.argmin(energy)) * frame + frame // 2
+
+def transcribe_blocks(engine, blocks, sample_rate=16000, window_seconds=300.0, search_seconds=10.0):
+    """Transkribiert einen Block-Strom fensterweise mit der Engine.
+    Fenster werden an leisen Stellen geschnitten, der Rest wandert ins nächste Fenster.
+    Liefert (Startzeit in Sekunden, Text, Metriken) je Fenster"""
+    import numpy as np
+
+    window_size = int(window_seconds * sample_rate)
+    search_size = int(search_seconds * sample_rate)
+    pending = []
+    pending_len = 0
+    offset = 0
+
+    def decode_window(audio):
+        text, metrics = engine.transcribe(audio)
+        metrics["audio_duration"] = len(audio) / sample_rate
+        return offset / sample_rate, text, metrics
+
+    for block in blocks:
+        pending.append(block)
+        pending_len += len(block)
+        if pending_len < window_size:
+            continue
+
+        audio = np.concatenate(pending)
+        while len(audio) >= window_size:
+            cut = find_quiet_cut(audio[:window_size], window_size - search_size, sample_rate)
+            yield decode_window(audio[:cut])
+            offset += cut
+            audio = audio[cut:]
+        pending = [audio]
+        pending_len = len(audio)
+
+    if pending_len:
+        yield decode_window(np.concatenate(pending))
+
+# Sharding: lange Aufnahmen an Stille-Grenzen teilen und parallel in mehreren Prozessen transkribieren
+_shard_engine = None
+
+def find_silence_cut(region, sample_rate=16000, min_gap_seconds=0.3):
+    """Sucht per Silero-VAD die längste Sprechpause im Bereich und gibt deren Mitte zurück
+    (None, falls keine ausreichend lange Pause gefunden wurde)"""
+    import numpy as np
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    region = np.asarray(region, dtype=np.float32)
+    speech = get_speech_timestamps(region, VadOptions(min_silence_duration_ms=int(min_gap_seconds * 1000),
+                                                      speech_pad_ms=100))
+    bounds = [0] + [b for chunk in speech for b in (chunk["start"], chunk["end"])] + [len(region)]
+    best_gap = int(min_gap_seconds * sample_rate)
+    best_cut = None
+    for gap_start, gap_end in zip(bounds[0::2], bounds[1::2]):
+        if gap_end - gap_start >= best_gap:
+            best_gap = gap_end - gap_start
+            best_cut = (gap_start + gap_end) // 2
+    return best_cut
+
+def iter_shards(blocks, sample_rate=16000, shard_seconds=120.0, search_seconds=15.0, overlap_seconds=1.0):
+    """Teilt einen Block-Strom in Shards, bevorzugt an VAD-Pausen im letzten Abschnitt.
+    Ohne Pause wird hart geschnitten und der nächste Shard überlappt um overlap_seconds.
+    Liefert (Index, Startzeit in Sekunden, Audio, überlappt)"""
+    import numpy as np
+
+    shard_size = int(shard_seconds * sample_rate)
+    search_size = int(search_seconds * sample_rate)
+    overlap_size = int(overlap_seconds * sample_rate)
+    pending = []
+    pending_len = 0
+    offset = 0
+    index = 0
+    overlapped = False
+
+    for block in blocks:
+        pending.append(block)
+        pending_len += len(block)
+        if pending_len < shard_size:
+            continue
+
+        audio = np.concatenate(pending)
+        while len(audio) >= shard_size:
+            search_start = shard_size - search_size
+            cut = find_silence_cut(audio[search_start:shard_size], sample_rate)
+            if cut is not None:
+                cut += search_start
+                next_start = cut
+            else:
+                cut = shard_size
+                next_start = cut - overlap_size
+
+            yield index, offset / sample_rate, audio[:cut].copy(), overlapped
+            index += 1
+            overlapped = next_start < cut
+            offset += next_start
+            audio = audio[next_start:]
+        pending = [audio]
+        pending_len = len(audio)
+
+    if pending_len:
+        yield index, offset / sample_rate, np.concatenate(pending), overlapped
+
+def merge_overlap(previous_text, next_text, max_words=12):
+    """Entfernt am Anfang von next_text die Wörter, die previous_text bereits am Ende enthält"""
+    def normalize(word):
+        return re.sub(r'[^\w]', '', word.lower())
+
+    previous_words = [normalize(w) for w in previous_text.split()[-max_words:]]
+    next_words = next_text.split()
+    normalized_next = [normalize(w) for w in next_words[:max_words]]
+
+    for size in range(min(len(previous_words), len(normalized_next)), 0, -1):
+        if previous_words[-size:] == normalized_next[:size]:
+            return " ".join(next_words[size:])
+    return next_text
+
+def _shard_worker_init(model_size, cpu_threads, engine_options, log_level):
+    """Initialisiert einen Shard-Prozess: eigenes Modell mit Anteil der CPU-Kerne"""
+    global _shard_engine
+
+    # Nur Console-Logging - mehrere Prozesse sollen nicht dieselbe Log-Datei rotieren
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - [%(processName)s] - %(message)s',
+                                           datefmt='%Y-%m-%d %H:%M:%S'))
+    logger.addHandler(handler)
+    logger.setLevel(log_level)
+
+    model, model_size = load_whisper_model(model_size, cpu_threads=cpu_threads)
+    if model is None:
+        raise RuntimeError(f"Modell {model_size} konnte im Shard-Prozess nicht geladen werden")
+    _shard_engine = TranscriptionEngine(model, model_size, **engine_options)
+
+def _transcribe_shard(index, audio):
+    """Läuft im Shard-Prozess: transkribiert einen Shard mit dem prozesseigenen Modell"""
+    start = time.time()
+    text, metrics = _shard_engine.transcribe(audio)
+    metrics["shard_time"] = time.time() - start
+    return index, text, metrics
+
+def create_shard_pool(model_size, engine_options, workers, log_level="WARNING"):
+    """Startet die Shard-Prozesse einmal pro Lauf - jeder lädt sein Modell nur beim Start"""
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    cpu_threads = max(1, (os.cpu_count() or 2) // workers)
+    logger.info(f"🧩 Sharding: {workers} Prozesse × {cpu_threads} Threads")
+
+    # spawn statt fork: kein Kopieren von laufenden Threads/Modellen des Elternprozesses
+    return ProcessPoolExecutor(max_workers=workers,
+                               mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_shard_worker_init,
+                               initargs=(model_size, cpu_threads, engine_options, log_level))
+
+def transcribe_file_sharded(path, pool, workers, shard_seconds=120.0, overlap_seconds=1.0):
+    """Transkribiert eine lange Datei parallel im Shard-Pool: Schnitte an Stille-Grenzen.
+    Die Teil-Transkripte werden in Reihenfolge zusammengesetzt und an Überlappungen bereinigt"""
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    results = {}
+    overlaps = {}
+    texts = []
+    audio_duration = 0.0
+    shard_times = []
+    pending = set()
+
+    def collect(done):
+        for future in done:
+            index, text, metrics = future.result()
+            results[index] = text
+            shard_times.append(metrics["shard_time"])
+            logger.info(f"   Shard {index} fertig in {metrics['shard_time']:.1f}s")
+
+    for index, offset, audio, overlapped in iter_shards(iter_audio_file(path), shard_seconds=shard_seconds,
+                                                        overlap_seconds=overlap_seconds):
+        # Startzeit + Länge statt Summe der Shards: Überlappungen nicht doppelt zählen
+        audio_duration = offset + len(audio) / 16000
+        overlaps[index] = overlapped
+        logger.debug(f"   Shard {index}: ab {offset:.1f}s, {len(audio)/16000:.1f}s"
+                     f"{' (überlappend)' if overlapped else ''}")
+        pending.add(pool.submit(_transcribe_shard, index, audio))
+
+        # Nur wenige Shards gleichzeitig im Speicher halten
+        if len(pending) >= workers + 2:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    done, _ = wait(pending)
+    collect(done)
+
+    if len(results) == 1:
+        # Kürzer als ein Shard: ein Auftrag, nichts zusammenzusetzen
+        text = results[0]
+    else:
+        # In Reihenfolge zusammensetzen, Überlappungen an den Grenzen entfernen
+        for index in sorted(results):
+            text = results[index]
+            if overlaps.get(index) and texts:
+                text = merge_overlap(texts[-1], text)
+            if text:
+                texts.append(text)
+        text = " ".join(texts)
+
+    metrics = {
+        "shards": len(results),
+        "workers": workers,
+        "audio_duration": audio_duration,
+        "shard_time_sum": sum(shard_times),
+    }
+    return text, metrics
+
+class MicroBatcher:
+    """Sammelt kurze Clips (bis 30s) mehrerer Anfragen für bis zu max_wait_ms bzw. max_items
+    und dekodiert sie gemeinsam über den gebatchten generate()-Pfad von CTranslate2"""
+
+    def __init__(self, engine, max_items=8, max_wait_ms=50, beam_size=5, no_speech_threshold=0.6):
+        self.engine = engine
+        self.max_items = max_items
+        self.max_wait = max_wait_ms / 1000.0
+        self.beam_size = beam_size
+        self.no_speech_threshold = no_speech_threshold
+        self.tokenizers = {}
+        self.stats = {"items": 0, "batches": 0, "busy_time": 0.0}
+        self.queue = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name="MicroBatcher", daemon=True)
+        self.worker.start()
+
+    def submit(self, audio):
+        """Stellt einen Clip ein, gibt ein Future mit (Text, Metriken) zurück"""
+        from concurrent.futures import Future
+
+        future = Future()
+        if len(audio) > 30 * self.engine.sample_rate:
+            # Längere Clips passen nicht in ein Encoder-Fenster → normaler Pfad
+            future.set_result(self.engine.transcribe(audio))
+        else:
+            self.queue.put((audio, future, time.time()))
+        return future
+
+    def _run(self):
+        while True:
+            first = self.queue.get()
+            if first is None:
+                break
+
+            batch = [first]
+            stop = False
+            deadline = time.time() + self.max_wait
+            while len(batch) < self.max_items:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                self._process(batch)
+            except Exception as e:
+                logger.error(f"Fehler im Micro-Batch ({len(batch)} Clips): {e}", exc_info=True)
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            if stop:
+                break
+
+    def _tokenizer(self, model, language):
+        from faster_whisper.tokenizer import Tokenizer
+
+        if language not in self.tokenizers:
+            self.tokenizers[language] = Tokenizer(model.hf_tokenizer, model.model.is_multilingual,
+                                                  task="transcribe", language=language)
+        return self.tokenizers[language]
+
+    def _process(self, batch):
+        """Features stapeln, ein generate()-Aufruf für alle Clips, Ergebnisse zurückverteilen"""
+        import numpy as np
+        import ctranslate2
+
+        start = time.time()
+        model = self.engine.model
+        n_frames = model.feature_extractor.nb_max_frames
+
+        features = []
+        prompts = []
+        tokenizers = []
+        languages = []  # Sprach-Metadaten pro Clip
+        mel_times = []
+        for audio, _, _ in batch:
+            language, language_info = self.engine.resolve_language(audio)
+            tokenizer = self._tokenizer(model, language)
+            mel_start = time.time()
+            mel = model.feature_extractor(audio)[:, :n_frames]
+            mel_times.append(time.time() - mel_start)
+            if mel.shape[-1] < n_frames:
+                mel = np.pad(mel, [(0, 0), (0, n_frames - mel.shape[-1])])
+            features.append(mel)
+            prompts.append(list(tokenizer.sot_sequence) + [tokenizer.no_timestamps])
+            tokenizers.append(tokenizer)
+            languages.append(language_info)
+
+        results = model.model.generate(
+            ctranslate2.StorageView.from_array(np.ascontiguousarray(np.stack(features), dtype=np.float32)),
+            prompts,
+            beam_size=self.beam_size,
+            max_length=448,
+            return_scores=True,
+            return_no_speech_prob=True,
+            suppress_blank=True,
+            suppress_tokens=[-1]
+        )
+        batch_time = time.time() - start
+
+        self.stats["items"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["busy_time"] += batch_time
+
+        for (audio, future, submitted), result, tokenizer, language_info, mel_time in zip(
+                batch, results, tokenizers, languages, mel_times):
+            text = tokenizer.decode(result.sequences_ids[0]).strip()
+            if result.no_speech_prob > self.no_speech_threshold:
+                text = ""
+            future.set_result((text, {
+                "decode_mode": "micro-batch",
+                **language_info,
+                "batch_size": len(batch),
+                "batch_time": batch_time,
+                "mel_time": mel_time,
+                "queue_wait": start - submitted,
+                "audio_duration": len(audio) / self.engine.sample_rate,
+            }))
+
+    def throughput(self):
+        """Clips pro Sekunde Rechenzeit"""
+        return self.stats["items"] / self.stats["busy_time"] if self.stats["busy_time"] else 0.0
+
+    def close(self):
+        self.queue.put(None)
+        self.worker.join()
+
+def read_short_clip(path, max_seconds=30.0):
+    """Liest eine Datei komplett, falls sie höchstens max_seconds lang ist (sonst None)"""
+    blocks = iter_audio_file(path, block_seconds=max_seconds)
+    first = next(blocks, None)
+    if first is None or next(blocks, None) is not None:
+        return None
+    return first
+
+def benchmark_batching(engine, clips, max_items, max_wait_ms):
+    """Vergleicht den Durchsatz des normalen Pfads (engine.transcribe je Clip) mit Micro-Batching"""
+    results = {}
+
+    start = time.time()
+    for clip in clips:
+        engine.transcribe(clip)
+    elapsed = time.time() - start
+    results["engine.transcribe"] = len(clips) / elapsed if elapsed else 0.0
+    logger.info(f"📊 engine.transcribe: {len(clips)} Clips in {elapsed:.2f}s → "
+                f"{results['engine.transcribe']:.2f} Clips/s")
+
+    label = f"Batch {max_items}"
+    batcher = MicroBatcher(engine, max_items=max_items, max_wait_ms=max_wait_ms)
+    start = time.time()
+    futures = [batcher.submit(clip) for clip in clips]
+    for future in futures:
+        future.result()
+    elapsed = time.time() - start
+    batcher.close()
+    results[label] = len(clips) / elapsed if elapsed else 0.0
+    logger.info(f"📊 {label}: {len(clips)} Clips in {elapsed:.2f}s → {results[label]:.2f} Clips/s "
+                f"({batcher.stats['batches']} Batches)")
+
+    unbatched, batched = results.values()
+    if unbatched:
+        logger.info(f"📊 Micro-Batching Speedup: {batched / unbatched:.2f}×")
+    return results
+
+# Wählbare Modellgrößen (--model, Modell-Menü)
+MODEL_SIZES = ['tiny-int8', 'base-int8', 'small-int8', 'medium-int8',
+               'tiny', 'base', 'small', 'medium', 'large-v2']
+
+def load_whisper_model(model_size, cpu_threads=2, fallback=True):
+    """Lädt ein Faster-Whisper Modell (CPU-optimiert), gibt (Modell, tatsächliche Größe) zurück.
+    Bei Fehlern wird auf tiny-int8 zurückgefallen (fallback=False: direkt None)"""
+    WhisperModel = get_whisper_model_class()
+    if WhisperModel is None:
+        logger.error("❌ Faster-Whisper nicht verfügbar")
+        return None, model_size
+
+    model_info = {
+        "tiny-int8": "Sehr schnell, INT8 quantisiert, ~39M",
+        "base-int8": "Schnell, INT8 quantisiert, ~74M",
+        "small-int8": "Ausgewogen, INT8 quantisiert, ~244M",
+        "medium-int8": "Genauer, INT8 quantisiert, ~769M",
+        "tiny": "Sehr schnell, ~39M Parameter",
+        "base": "Schnell, ~74M Parameter",
+        "small": "Ausgewogen, ~244M Parameter",
+        "medium": "Genauer, ~769M Parameter",
+        "large-v2": "Beste Genauigkeit, ~1550M Parameter"
+    }
+
+    # Model name mapping für faster-whisper (MULTILINGUAL!)
+    model_mapping = {
+        "tiny-int8": "tiny",      # Geändert: ohne .en für Deutsch!
+        "base-int8": "base",      # Geändert: ohne .en für Deutsch!
+        "small-int8": "small",    # Geändert: ohne .en für Deutsch!
+        "medium-int8": "medium",  # Geändert: ohne .en für Deutsch!
+        "tiny": "tiny",
+        "base": "base",
+        "small": "small",
+        "medium": "medium",
+        "large-v2": "large-v2"
+    }
+
+    logger.info(f"🔄 Lade Faster-Whisper {model_size} Modell...")
+    if model_size in model_info:
+        logger.info(f"   Info: {model_info[model_size]}")
+
+    try:
+        import psutil
+        ram_gb = psutil.virtual_memory().total / (1024**3)
+        available_gb = psutil.virtual_memory().available / (1024**3)
+        logger.info(f"   System: {ram_gb:.1f}GB RAM total, {available_gb:.1f}GB verfügbar")
+    except Exception as e:
+        logger.debug(f"Fehler beim Abrufen von RAM-Informationen: {e}")
+
+    try:
+        actual_model = model_mapping.get(model_size, model_size)
+
+        # INT8 Quantisierung für bessere CPU Performance
+        # Für CPU: int8 bei quantisierten Modellen, sonst int8 (stabiler als float32)
+        if "int8" in model_size:
+            compute_type = "int8"
+        else:
+            # Auch bei nicht-quantisierten Modellen int8 verwenden für CPU-Stabilität
+            compute_type = "int8"
+            logger.info(f"   Hinweis: Verwende int8 für CPU-Stabilität (statt float16/float32)")
+
+        model = WhisperModel(
+            actual_model,
+            device="cpu",
+            compute_type=compute_type,
+            num_workers=1,  # 1 Worker für stabile CPU-Nutzung
+            cpu_threads=cpu_threads  # Standard 2 Threads für i5-7200U (verhindert Thrashing)
+        )
+        logger.info(f"✅ Modell {model_size} geladen (Compute: {compute_type})")
+
+    except Exception as e:
+        logger.error(f"❌ Fehler beim Laden des Modells: {e}", exc_info=True)
+        if not fallback:
+            return None, model_size
+        logger.info("   Versuche kleineres Modell...")
+        model_size = "tiny-int8"
+        try:
+            model = WhisperModel("tiny", device="cpu", compute_type="int8", cpu_threads=cpu_threads)
+            logger.info(f"✅ Fallback auf {model_size} Modell erfolgreich")
+        except Exception as e2:
+            logger.critical(f"❌ Auch Fallback fehlgeschlagen: {e2}", exc_info=True)
+            logger.error("   Mögliche Lösungen:")
+            logger.error("   1. Stelle sicher, dass Faster-Whisper installiert ist")
+            logger.error("   2. Prüfe die Internetverbindung (Models werden heruntergeladen)")
+            logger.error("   3. Prüfe freien Speicherplatz auf der Festplatte")
+            model = None
+
+    return model, model_size
+
+class ResourceGovernor:
+    """Prüft vor jeder Transkription freien RAM und CPU-Last, weicht unter Druck auf ein
+    kleineres, vorgeladenes Modell aus und senkt während der Dekodierung die Priorität.
+    Die CPU-Last misst ein Hintergrund-Thread alle sample_interval Sekunden; admit() nutzt
+    den Mittelwert der letzten window_seconds außerhalb eigener Dekodierungen."""
+
+    def __init__(self, fallback_engine=None, min_available_mb=800, max_cpu_percent=85.0,
+                 lower_priority=True, sample_interval=0.5, window_seconds=3.0):
+        import psutil
+        from collections import deque
+
+        self.psutil = psutil
+        self.process = psutil.Process()
+        self.fallback_engine = fallback_engine
+        self.min_available_mb = min_available_mb
+        self.max_cpu_percent = max_cpu_percent
+        self.lower_priority = lower_priority
+        self.sample_interval = sample_interval
+        self.samples = deque(maxlen=max(1, int(window_seconds / sample_interval)))
+        # Zähler der Dekodier-Starts/-Enden: Messintervalle mit eigener Last werden verworfen
+        self.decode_epoch = 0
+        self.decoding = 0
+        self.restore_priority = None
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.sampler = threading.Thread(target=self._sample_cpu, name="Governor-CPU", daemon=True)
+        self.sampler.start()
+
+    def _sample_cpu(self):
+        # Erster Aufruf liefert immer 0.0 → nur Messfenster starten
+        self.psutil.cpu_percent(interval=None)
+        epoch = self.decode_epoch
+        while not self.stop_event.wait(self.sample_interval):
+            cpu_percent = self.psutil.cpu_percent(interval=None)
+            if epoch == self.decode_epoch and not self.decoding:
+                self.samples.append(cpu_percent)
+            epoch = self.decode_epoch
+
+    def recent_cpu_percent(self):
+        """Mittlere CPU-Last der letzten Sekunden ohne eigene Dekodierungen (0.0 ohne Messwerte)"""
+        samples = list(self.samples)
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def close(self):
+        self.stop_event.set()
+        self.sampler.join(timeout=2)
+
+    def admit(self, engine):
+        """Wählt die Engine für den nächsten Job, gibt (Engine, Entscheidungs-Metriken) zurück"""
+        available_mb = self.psutil.virtual_memory().available / 1024**2
+        cpu_percent = self.recent_cpu_percent()
+
+        reasons = []
+        if available_mb < self.min_available_mb:
+            reasons.append(f"RAM frei {available_mb:.0f}MB < {self.min_available_mb}MB")
+        if cpu_percent > self.max_cpu_percent:
+            reasons.append(f"CPU {cpu_percent:.0f}% > {self.max_cpu_percent:.0f}%")
+
+        if not reasons:
+            action = "primary"
+        elif self.fallback_engine is not None and self.fallback_engine.model is not None:
+            action = "fallback"
+            engine = self.fallback_engine
+        else:
+            action = "primary-under-pressure"
+
+        logger.info(f"⚖️ Governor: RAM frei {available_mb:.0f}MB, CPU {cpu_percent:.0f}% → {action} "
+                    f"({engine.model_size}){': ' + ', '.join(reasons) if reasons else ''}")
+        return engine, {
+            "governor_action": action,
+            "available_mb": available_mb,
+            "cpu_percent": cpu_percent,
+        }
+
+    @contextmanager
+    def decode_priority(self):
+        """Niedrigere Priorität während der Dekodierung: Windows Prozess-Prioritätsklasse
+        (gilt auch für die CTranslate2-Threads). Unter Linux/macOS nur nice für den aufrufenden
+        Thread - die Rechen-Threads von CTranslate2 behalten ihre Priorität, die Absenkung wirkt dort
+        also kaum (den ganzen Prozess zu renicen ließe sich ohne Rechte nicht zurücknehmen)"""
+        # Hauptdekodierung und Spekulation können überlappen: die Prozess-Priorität senkt
+        # die erste Dekodierung, zurückgesetzt wird erst nach der letzten
+        with self.lock:
+            self.decoding += 1
+            self.decode_epoch += 1
+            if self.decoding == 1 and self.lower_priority:
+                self.restore_priority = self._lower_process_priority()
+        if self.lower_priority:
+            self._lower_thread_priority()
+
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.decoding -= 1
+                self.decode_epoch += 1
+                restore = self.restore_priority if self.decoding == 0 else None
+                if restore:
+                    self.restore_priority = None
+            if restore:
+                try:
+                    restore()
+                except Exception as e:
+                    logger.warning(f"Governor: Priorität konnte nicht wiederhergestellt werden: {e}")
+
+    def _lower_process_priority(self):
+        """Windows: Prozess auf BELOW_NORMAL, gibt die Rücksetz-Funktion zurück (sonst None)"""
+        if sys.platform != "win32":
+            return None
+        try:
+            previous = self.process.nice()
+            self.process.nice(self.psutil.BELOW_NORMAL_PRIORITY_CLASS)
+            logger.debug("Governor: Prozess-Priorität auf BELOW_NORMAL gesenkt")
+            return lambda: self.process.nice(previous)
+        except Exception as e:
+            logger.debug(f"Governor: Priorität konnte nicht gesenkt werden: {e}")
+            return None
+
+    def _lower_thread_priority(self):
+        """Linux/macOS: nice +5 für den aufrufenden Thread (Verarbeitung bzw. Spekulation)"""
+        if sys.platform == "win32" or not hasattr(os, "setpriority"):
+            return
+        try:
+            # Höhere nice-Werte lassen sich ohne Rechte nicht zurücknehmen → nur dieser Thread
+            tid = threading.get_native_id()
+            os.setpriority(os.PRIO_PROCESS, tid, os.getpriority(os.PRIO_PROCESS, tid) + 5)
+            logger.debug(f"Governor: nice +5 für Thread {tid}")
+        except Exception as e:
+            logger.debug(f"Governor: Priorität konnte nicht gesenkt werden: {e}")
+
+class SamplingProfiler:
+    """Stichproben-Profiler: nimmt alle interval_ms die Stacks aller Python-Threads auf
+    (Aufnahme, Verarbeitung, Ausgabe, Ducking, GUI) - nur während der nächsten K Diktate.
+    Ergebnis im "folded"-Format für flamegraph.pl / speedscope neben spracherkennung.log."""
+
+    def __init__(self, interval_ms=5.0, dictations=3, output_dir=None):
+        self.interval = interval_ms / 1000.0
+        self.dictations = dictations
+        self.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+        self.lock = threading.Lock()
+        self.remaining = 0  # Diktate, die noch profiliert werden
+        self.sampling = threading.Event()  # Gesetzt während eines Diktats
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.samples = {}
+        self.sample_count = 0
+        self.overhead = 0.0
+
+    def arm(self, dictations=None):
+        """Profiling für die nächsten K Diktate aktivieren"""
+        with self.lock:
+            self.remaining = dictations or self.dictations
+        logger.info(f"🔬 Profiling aktiv für die nächsten {self.remaining} Diktate "
+                    f"(alle {self.interval*1000:.0f}ms)")
+
+    def is_active(self):
+        return self.remaining > 0 or self.thread is not None
+
+    def toggle(self):
+        """Hotkey: aktivieren bzw. vorzeitig beenden und Ergebnis schreiben"""
+        if self.is_active():
+            self.stop()
+        else:
+            self.arm()
+
+    def begin_dictation(self):
+        with self.lock:
+            if self.remaining <= 0:
+                return
+            if self.thread is None:
+                self.samples = {}
+                self.sample_count = 0
+                self.overhead = 0.0
+                self.stop_event.clear()
+                self.thread = threading.Thread(target=self._run, name="Sampling-Profiler", daemon=True)
+                self.thread.start()
+        self.sampling.set()
+
+    def end_dictation(self):
+        with self.lock:
+            if self.thread is None or not self.sampling.is_set():
+                return
+            self.sampling.clear()
+            self.remaining -= 1
+            if self.remaining > 0:
+                return
+        self.stop()
+
+    def stop(self):
+        """Beendet das Sampling und schreibt das Profil (falls Stichproben vorliegen)"""
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+            self.remaining = 0
+        self.sampling.clear()
+        if thread is None:
+            logger.info("🔬 Profiling deaktiviert")
+            return None
+        self.stop_event.set()
+        thread.join()
+        return self.write()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self.stop_event.is_set():
+            if not self.sampling.wait(0.1):
+                continue
+            start = time.perf_counter()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                # "Thread-7 (process_audio)" → "process_audio", damit sich Diktate aufsummieren
+                thread_name = re.sub(r"^Thread-\d+ \((.*)\)$", r"\1", names.get(ident, str(ident)))
+                key = ";".join([thread_name] + stack[::-1])
+                self.samples[key] = self.samples.get(key, 0) + 1
+            self.sample_count += 1
+            self.overhead += time.perf_counter() - start
+            self.stop_event.wait(self.interval)
+
+    def write(self):
+        """Schreibt das Profil (folded) und loggt die häufigsten Funktionen"""
+        if not self.samples:
+            logger.info("🔬 Profiling beendet - keine Stichproben")
+            return None
+
+        path = os.path.join(self.output_dir, f"spracherkennung_profile_{datetime.now():%Y%m%d_%H%M%S}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+        per_thread = {}
+        per_leaf = {}
+        for stack, count in self.samples.items():
+            frames = stack.split(";")
+            per_thread[frames[0]] = per_thread.get(frames[0], 0) + count
+            # Blockierendes Warten (Queues, Events, Locks) ist Leerlauf, keine Rechenzeit
+            if not re.search(r"\((threading|queue)\.py:\d+\)$", frames[-1]):
+                per_leaf[frames[-1]] = per_leaf.get(frames[-1], 0) + count
+
+        logger.info(f"🔬 Profil geschrieben: {path} ({self.sample_count} Stichproben, "
+                    f"Overhead {self.overhead*1000/max(1, self.sample_count):.2f}ms/Stichprobe)")
+        logger.info("   Threads: " + ", ".join(f"{name}={count}" for name, count in
+                                              sorted(per_thread.items(), key=lambda item: -item[1])))
+        logger.info("   Häufigste Funktionen (ohne Warten):")
+        for leaf, count in sorted(per_leaf.items(), key=lambda item: -item[1])[:5]:
+            logger.info(f"   {count:6d}  {leaf}")
+        return path
+
+class SpeculativeDecoder:
+    """Spekulative Dekodierung: erkennt während der Aufnahme eine Sprechpause (RMS) und dekodiert
+    das bisher Aufgenommene schon im Hintergrund. Kam bis zum Stopp keine neue Sprache, wird das
+    Ergebnis direkt verwendet ("hit"), sonst wird nur der neue Teil dekodiert und angehängt ("extended")."""
+
+    def __init__(self, engine, sample_rate=16000, silence_ms=700, min_speech_ms=300, threshold=0.01,
+                 decode_context=None):
+        self.engine = engine
+        # Kontext um jede Hintergrund-Dekodierung (Governor: Priorität senken, CPU-Messung pausieren)
+        self.decode_context = decode_context or nullcontext
+        self.sample_rate = sample_rate
+        self.silence_samples = int(silence_ms / 1000 * sample_rate)
+        self.min_speech_samples = int(min_speech_ms / 1000 * sample_rate)
+        self.threshold = threshold  # RMS-Schwelle für Sprache (wie bei der Sprach-Probe)
+        # Schützt speculation/closed: der Aufnahme-Thread kann nach dem Stopp noch observe() aufrufen
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Vor jeder Aufnahme aufrufen"""
+        self.scanned_frames = 0
+        self.samples_seen = 0
+        self.speech_samples = 0
+        self.last_voice = 0  # Sample-Position hinter dem letzten Chunk mit Sprache
+        with self.lock:
+            self.speculation = None
+            self.closed = False  # Nach finish()/discard() keine neuen Spekulationen
+
+    def _is_voiced(self, samples):
+        import numpy as np
+        return len(samples) and np.sqrt(np.mean(np.square(samples))) > self.threshold
+
+    def observe(self, frames):
+        """Aus dem Aufnahme-Loop: neue PCM-Chunks prüfen, bei Pause nach Sprache spekulieren"""
+        import numpy as np
+
+        count = len(frames)
+        for data in frames[self.scanned_frames:count]:
+            samples = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+            self.samples_seen += len(samples)
+            if self._is_voiced(samples):
+                self.speech_samples += len(samples)
+                self.last_voice = self.samples_seen
+        self.scanned_frames = count
+
+        with self.lock:
+            speculation = self.speculation
+            if (not self.closed
+                    and self.speech_samples >= self.min_speech_samples
+                    and self.samples_seen - self.last_voice >= self.silence_samples
+                    and (speculation is None or self.last_voice > speculation["point"])
+                    and not (speculation and speculation["thread"].is_alive())):
+                self._start(b''.join(frames[:count]))
+
+    def _start(self, audio_bytes):
+        import numpy as np
+
+        speculation = {
+            "point": self.samples_seen,
+            "result": None,
+            "error": None,
+        }
+
+        def run():
+            audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+            try:
+                with self.decode_context():
+                    speculation["result"] = self.engine.transcribe(audio)
+            except Exception as e:
+                speculation["error"] = e
+                logger.warning(f"Spekulative Dekodierung fehlgeschlagen: {e}")
+
+        speculation["thread"] = threading.Thread(target=run, name="Speculative-Decode", daemon=True)
+        self.speculation = speculation
+        speculation["thread"].start()
+        logger.info(f"⚡ Pause erkannt - spekulative Dekodierung der ersten "
+                    f"{speculation['point'] / self.sample_rate:.1f}s gestartet")
+
+    def _close(self):
+        """Beendet die Aufnahme für den Spekulierer, gibt die letzte Spekulation zurück"""
+        with self.lock:
+            self.closed = True
+            speculation = self.speculation
+            self.speculation = None
+        return speculation
+
+    def discard(self):
+        """Beim Stopp ohne Übernahme (z.B. Governor wählt anderes Modell): Ergebnis verwerfen.
+        Gibt zurück, ob eine Spekulation lief"""
+        if self._close() is None:
+            return False
+        logger.info("⚡ Spekulation verworfen (anderes Modell gewählt)")
+        return True
+
+    def finish(self, audio):
+        """Beim Stopp: gibt (Text, Metriken) zurück, oder None wenn normal dekodiert werden muss"""
+        speculation = self._close()
+        if speculation is None:
+            return None
+
+        wait_start = time.time()
+        speculation["thread"].join()
+        wait_time = time.time() - wait_start
+        if speculation["result"] is None or not speculation["result"][0]:
+            logger.info("⚡ Spekulation verworfen (kein Ergebnis)")
+            return None
+
+        text, metrics = speculation["result"]
+        metrics = dict(metrics)
+        metrics["speculation_point"] = speculation["point"] / self.sample_rate
+        metrics["speculation_wait"] = wait_time
+
+        # Neue Sprache nach dem Spekulationspunkt? (Chunks à 1024 Samples wie bei der Aufnahme)
+        point = speculation["point"]
+        tail = audio[point:]
+        frame = 1024
+        new_speech = any(self._is_voiced(tail[i:i + frame]) for i in range(0, len(tail), frame))
+        if not new_speech:
+            metrics["speculation"] = "hit"
+            logger.info(f"⚡ Spekulation übernommen (Wartezeit {wait_time*1000:.0f}ms)")
+            return text, metrics
+
+        # Nur den neuen Teil (mit etwas Vorlauf aus der Pause) dekodieren und anhängen
+        start = max(0, point - int(0.2 * self.sample_rate))
+        tail_text, tail_metrics = self.engine.transcribe(audio[start:])
+        metrics["speculation"] = "extended"
+        metrics["segments"] = metrics.get("segments", 0) + tail_metrics.get("segments", 0)
+        metrics["tail_duration"] = (len(audio) - start) / self.sample_rate
+        logger.info(f"⚡ Spekulation erweitert um {metrics['tail_duration']:.1f}s")
+        return " ".join(t for t in (text, tail_text) if t), metrics
+
+class PrerollCapture:
+    """Dauerhaft offener Eingabe-Stream (Callback-Modus) mit Ringpuffer für die letzten preroll_ms.
+    Beim Aufnahmestart wird der Ringpuffer vorangestellt → die erste Silbe geht nicht verloren."""
+
+    def __init__(self, audio, rate=16000, chunk=1024, format=8, channels=1, preroll_ms=500, continue_flag=0):
+        import math
+        from collections import deque
+
+        self.audio = audio
+        self.rate = rate
+        self.chunk = chunk
+        self.format = format
+        self.channels = channels
+        self.preroll_ms = preroll_ms
+        self.ring = deque(maxlen=max(1, math.ceil(preroll_ms / 1000 * rate / chunk)))
+        self.lock = threading.Lock()
+        self.target = None  # Frame-Liste der laufenden Aufnahme (None = nur Ringpuffer)
+        self.stream = None
+        self.continue_flag = continue_flag  # pyaudio.paContinue
+
+    def open(self):
+        """Öffnet den Stream; Frames kommen ab jetzt über _callback"""
+        self.stream = self.audio.open(
+            format=self.format,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            frames_per_buffer=self.chunk,
+            stream_callback=self._callback
+        )
+        self.stream.start_stream()
+        logger.info(f"🎙️ Pre-Roll aktiv: Mikrofon bleibt offen, {len(self.ring)}/{self.ring.maxlen} Chunks "
+                    f"(~{self.ring.maxlen * self.chunk / self.rate * 1000:.0f}ms) Vorlauf")
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        with self.lock:
+            if self.target is not None:
+                self.target.append(in_data)
+            else:
+                self.ring.append(in_data)
+        return None, self.continue_flag
+
+    def is_active(self):
+        try:
+            return self.stream is not None and self.stream.is_active()
+        except Exception:
+            return False
+
+    def start_capture(self, frames):
+        """Leitet den Stream in frames um, gibt die vorangestellte Dauer in ms zurück (None: Stream tot)"""
+        if not self.is_active():
+            return None
+        with self.lock:
+            frames.extend(self.ring)
+            preroll_bytes = sum(len(data) for data in self.ring)
+            self.ring.clear()
+            self.target = frames
+        return preroll_bytes / (2 * self.channels) / self.rate * 1000
+
+    def stop_capture(self):
+        with self.lock:
+            self.target = None
+
+    def close(self):
+        self.stop_capture()
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            finally:
+                self.stream = None
+
 class OptimizedSpeechToTextApp:
-    def __init__(self, model_size="small-int8"):
+    def __init__(self, model_size="small-int8", language="de", decode_mode="beam",
+                 redecode_logprob=-1.0, redecode_compression=2.4, output_sinks=None, ducking=None,
+                 preroll_ms=0, history=None, governor=None, fallback_model=None,
+                 headless=False, audio_module=None, session_dir=None, profiler=None,
+                 speculative_silence_ms=0):
         self.is_recording = False
         self.audio_frames = []
+        # audio_module ersetzt pyaudio (Replay-Modus), headless ersetzt GUI und Hotkeys
+        pyaudio = audio_module or lazy_import("pyaudio")
         self.audio = pyaudio.PyAudio()
+        self.headless = headless
+
+        # Stichproben-Profiler (CLI oder Hotkey STRG+SHIFT+P), standardmäßig inaktiv
+        self.profiler = profiler or SamplingProfiler()
+
+        # Optional: jede Aufnahme als WAV + erkannter Text ablegen (Fixtures für --replay)
+        self.session_dir = session_dir
+        self.session_counter = 0
         self.stream = None
         self.model = None
         self.model_size = model_size
@@ -151,12 +2435,23 @@ class OptimizedSpeechToTextApp:
         self.recording_thread = None
         self.processing_thread = None
 
-        # AIMP Kontrolle
-        self.aimp_original_volume = None
-        self.aimp_volume_interface = None
-        self.reduce_volume_percent = 0.07  # Reduziere auf 7% während Aufnahme (noch leiser!)
-        self.fade_duration = 1.0  # Fade-In Dauer in Sekunden
-        self.fade_steps = 20  # Anzahl der Schritte für sanftes Fade
+        # Modellwechsel zur Laufzeit (Menü, Hotkey oder switch_model())
+        self.switch_lock = threading.Lock()
+        self.switch_thread = None
+        self.switch_cycle = ['tiny-int8', 'base-int8', 'small-int8', 'medium-int8']  # Reihenfolge für den Hotkey
+
+        # Ausgabe läuft geordnet in eigenem Worker (Zwischenablage, Auto-Paste, ...)
+        if output_sinks is None:
+            output_sinks = create_output_sinks("clipboard,paste")
+        self.output = OutputDispatcher(output_sinks, on_delivered=self.on_output_delivered)
+        self.stop_time = 0.0
+
+        # Musik-Player (AIMP, ...) während der Aufnahme leiser stellen
+        self.ducking = ducking
+
+        # Verlauf aller Transkripte (Suche + erneut einfügen)
+        self.history = history
+        self.history_window = None
 
         # Audio settings
         self.chunk = 1024
@@ -165,98 +2460,219 @@ class OptimizedSpeechToTextApp:
         self.rate = 16000
         self.max_recording_time = 120  # 2 Minuten
 
+        # Optional: Mikrofon bleibt offen, Ringpuffer liefert den Vorlauf vor dem Hotkey
+        self.preroll = PrerollCapture(self.audio, self.rate, self.chunk, self.format, self.channels,
+                                      preroll_ms, pyaudio.paContinue) if preroll_ms > 0 else None
+        self.dictation_metrics = {}  # Metriken der aktuellen Aufnahme (Mikrofon, Pre-Roll)
+
         # Füllwörter zum Entfernen
         self.filler_words = [
             "ähm", "äh", "hm", "also", "sozusagen", "quasi", "gewissermaßen",
             "eigentlich", "praktisch", "halt", "irgendwie", "wohl", "mal"
         ]
 
-        self.load_model()
-        self.setup_gui()
-        self.setup_hotkey()
-        self.find_aimp()
+        with startup_phase("Modell laden"):
+            self.load_model()
+        engine_options = dict(
+            language=language,
+            decode_mode=decode_mode,
+            redecode_logprob=redecode_logprob,
+            redecode_compression=redecode_compression,
+            sample_rate=self.rate
+        )
+        self.engine = TranscriptionEngine(self.model, self.model_size, **engine_options)
+        logger.info(f"Dekodier-Modus: {decode_mode}, Sprache: {language}")
+
+        # Governor: Zulassung nach RAM/CPU, optional mit vorgeladenem kleinerem Modell
+        self.governor = governor
+        if self.governor and fallback_model:
+            with startup_phase("Fallback-Modell laden"):
+                model, model_size = load_whisper_model(fallback_model, fallback=False)
+            if model is not None:
+                self.governor.fallback_engine = TranscriptionEngine(model, model_size, **engine_options)
+                logger.info(f"⚖️ Governor: Fallback-Modell {model_size} bereit")
+
+        # Spekulative Dekodierung in Sprechpausen (0 = aus), läuft wie jede Dekodierung unter dem Governor
+        self.speculator = SpeculativeDecoder(
+            self.engine, self.rate, speculative_silence_ms,
+            decode_context=self.governor.decode_priority if self.governor else None
+        ) if speculative_silence_ms > 0 else None
+        with startup_phase("GUI aufbauen"):
+            if headless:
+                self.setup_null_gui()
+            else:
+                self.setup_gui()
+        with startup_phase("Hotkeys registrieren"):
+            if headless:
+                self.listener = None
+            else:
+                self.setup_hotkey()
+        if self.preroll:
+            with startup_phase("Mikrofon öffnen"):
+                try:
+                    self.preroll.open()
+                except Exception as e:
+                    logger.warning(f"⚠️ Pre-Roll nicht verfügbar, Stream wird pro Aufnahme geöffnet: {e}")
+                    self.preroll = None
+        with startup_phase("Ducking starten"):
+            if self.ducking is None:
+                self.ducking = DuckingService(create_volume_backend())
 
     def load_model(self):
         """Lädt das Faster-Whisper Modell (CPU-optimiert)"""
-        if not FASTER_WHISPER_AVAILABLE:
-            logger.error("❌ Faster-Whisper nicht verfügbar")
-            return
+        self.model, self.model_size = load_whisper_model(self.model_size)
 
-        model_info = {
-            "tiny-int8": "Sehr schnell, INT8 quantisiert, ~39M",
-            "base-int8": "Schnell, INT8 quantisiert, ~74M",
-            "small-int8": "Ausgewogen, INT8 quantisiert, ~244M",
-            "medium-int8": "Genauer, INT8 quantisiert, ~769M",
-            "tiny": "Sehr schnell, ~39M Parameter",
-            "base": "Schnell, ~74M Parameter",
-            "small": "Ausgewogen, ~244M Parameter",
-            "medium": "Genauer, ~769M Parameter",
-            "large-v2": "Beste Genauigkeit, ~1550M Parameter"
-        }
+    def switch_model(self, model_size):
+        """Wechselt das Modell zur Laufzeit ohne Neustart: das neue Modell lädt im Hintergrund,
+        das alte transkribiert weiter, danach atomarer Tausch. Gibt den Lade-Thread zurück"""
+        if model_size not in MODEL_SIZES:
+            logger.warning(f"Unbekannte Modellgröße: {model_size}")
+            return None
 
-        # Model name mapping für faster-whisper (MULTILINGUAL!)
-        model_mapping = {
-            "tiny-int8": "tiny",      # Geändert: ohne .en für Deutsch!
-            "base-int8": "base",      # Geändert: ohne .en für Deutsch!
-            "small-int8": "small",    # Geändert: ohne .en für Deutsch!
-            "medium-int8": "medium",  # Geändert: ohne .en für Deutsch!
-            "tiny": "tiny",
-            "base": "base",
-            "small": "small",
-            "medium": "medium",
-            "large-v2": "large-v2"
-        }
+        with self.switch_lock:
+            if self.switch_thread and self.switch_thread.is_alive():
+                logger.warning("⚠️ Modellwechsel läuft bereits - ignoriert")
+                self.show_notification("⚠️ Modellwechsel läuft bereits", True)
+                return None
+            if model_size == self.model_size:
+                logger.info(f"Modell {model_size} ist bereits aktiv")
+                return None
+
+            self.switch_thread = threading.Thread(target=self._switch_model_worker, args=(model_size,),
+                                                  name="Model-Switch", daemon=True)
+            self.switch_thread.start()
+            return self.switch_thread
+
+    def cycle_model(self):
+        """Hotkey-Handler: wechselt zur nächsten Größe in switch_cycle"""
+        if self.model_size in self.switch_cycle:
+            index = (self.switch_cycle.index(self.model_size) + 1) % len(self.switch_cycle)
+        else:
+            index = 0
+        self.switch_model(self.switch_cycle[index])
 
-        logger.info(f"🔄 Lade Faster-Whisper {self.model_size} Modell...")
-        if self.model_size in model_info:
-            logger.info(f"   Info: {model_info[self.model_size]}")
+    def _switch_model_worker(self, model_size):
+        """Lädt das neue Modell, tauscht es in der Engine aus und gibt das alte frei"""
+        import psutil
+        process = psutil.Process()
+        old_size = self.model_size
+        rss_before = process.memory_info().rss / 1024**2
 
-        try:
-            import psutil
-            ram_gb = psutil.virtual_memory().total / (1024**3)
-            available_gb = psutil.virtual_memory().available / (1024**3)
-            logger.info(f"   System: {ram_gb:.1f}GB RAM total, {available_gb:.1f}GB verfügbar")
-        except Exception as e:
-            logger.debug(f"Fehler beim Abrufen von RAM-Informationen: {e}")
+        logger.info(f"🔁 Modellwechsel {old_size} → {model_size} gestartet (RSS vorher: {rss_before:.0f}MB)")
+        self.show_notification(f"🔁 Lade {model_size}...")
 
         try:
-            actual_model = model_mapping.get(self.model_size, self.model_size)
+            start = time.time()
+            model, actual_size = load_whisper_model(model_size, fallback=False)
+            load_time = time.time() - start
+            if model is None:
+                logger.error(f"❌ Modellwechsel fehlgeschlagen - {old_size} bleibt aktiv")
+                self.show_notification(f"❌ {model_size} nicht geladen, bleibe bei {old_size}", True)
+                return
 
-            # INT8 Quantisierung für bessere CPU Performance
-            # Für CPU: int8 bei quantisierten Modellen, sonst int8 (stabiler als float32)
-            if "int8" in self.model_size:
-                compute_type = "int8"
-            else:
-                # Auch bei nicht-quantisierten Modellen int8 verwenden für CPU-Stabilität
-                compute_type = "int8"
-                logger.info(f"   Hinweis: Verwende int8 für CPU-Stabilität (statt float16/float32)")
-
-            self.model = WhisperModel(
-                actual_model,
-                device="cpu",
-                compute_type=compute_type,
-                num_workers=1,  # 1 Worker für stabile CPU-Nutzung
-                cpu_threads=2   # 2 Threads für i5-7200U (verhindert Thrashing)
-            )
-            logger.info(f"✅ Modell {self.model_size} geladen (Compute: {compute_type})")
+            # Wartet ggf. auf eine laufende Transkription, danach nutzen alle neuen Aufnahmen das neue Modell
+            old_model = self.engine.swap_model(model, actual_size)
+            self.model = model
+            self.model_size = actual_size
+            del old_model
+            gc.collect()
 
+            rss_after = process.memory_info().rss / 1024**2
+            logger.info(f"✅ Modell gewechselt: {old_size} → {actual_size} in {load_time:.1f}s, "
+                        f"RSS {rss_before:.0f}MB → {rss_after:.0f}MB")
+            status_text = "STRG+Space" if get_keyboard() else "STRG+Space / F9"
+            self.show_notification(f"Bereit • {actual_size} • {status_text}")
+            self.perf_label.config(text=f"{old_size} → {actual_size} • RAM {rss_before:.0f} → {rss_after:.0f}MB")
         except Exception as e:
-            logger.error(f"❌ Fehler beim Laden des Modells: {e}", exc_info=True)
-            logger.info("   Versuche kleineres Modell...")
-            self.model_size = "tiny-int8"
-            try:
-                self.model = WhisperModel("tiny", device="cpu", compute_type="int8")
-                logger.info(f"✅ Fallback auf {self.model_size} Modell erfolgreich")
-            except Exception as e2:
-                logger.critical(f"❌ Auch Fallback fehlgeschlagen: {e2}", exc_info=True)
-                logger.error("   Mögliche Lösungen:")
-                logger.error("   1. Stelle sicher, dass Faster-Whisper installiert ist")
-                logger.error("   2. Prüfe die Internetverbindung (Models werden heruntergeladen)")
-                logger.error("   3. Prüfe freien Speicherplatz auf der Festplatte")
-                self.model = None
+            logger.error(f"❌ Fehler beim Modellwechsel: {type(e).__name__}: {e}", exc_info=True)
+            self.show_notification("❌ Modellwechsel fehlgeschlagen", True)
+        finally:
+            self.model_var.set(self.model_size)
+
+    def repaste_history(self, entry_id):
+        """Gibt einen früheren Verlaufseintrag erneut aus (ohne neue Transkription)"""
+        entry = self.history.get(entry_id) if self.history else None
+        if entry is None:
+            self.show_notification(f"❌ Verlaufseintrag #{entry_id} nicht gefunden", True)
+            return False
+
+        logger.info(f"📚 Verlaufseintrag #{entry_id} wird erneut ausgegeben")
+        self.output.submit(entry["text"], {"history_id": entry_id, "processing_time": 0.0}, stop_time=time.time())
+        return True
+
+    def open_history_window(self):
+        """Suchfenster für den Verlauf: Tippen sucht, Enter/Doppelklick gibt den Eintrag erneut aus"""
+        import tkinter as tk
+
+        if not self.history:
+            self.show_notification("ℹ️ Verlauf ist deaktiviert", True)
+            return
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.deiconify()
+            self.history_window.lift()
+            return
+
+        bg_color = "#1e1e1e"
+        fg_color = "#e0e0e0"
+        window = tk.Toplevel(self.root)
+        window.title("Verlauf")
+        window.geometry("460x280")
+        window.configure(bg=bg_color)
+        window.attributes('-topmost', True)
+
+        query = tk.StringVar()
+        search_entry = tk.Entry(window, textvariable=query, font=("Segoe UI", 9), bg="#2d2d2d", fg=fg_color,
+                                insertbackground=fg_color, relief="flat")
+        search_entry.pack(fill="x", padx=8, pady=(8, 4))
+        listbox = tk.Listbox(window, font=("Segoe UI", 9), bg=bg_color, fg=fg_color, relief="flat",
+                             selectbackground="#4a9eff", activestyle="none")
+        listbox.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+
+        results = []
+
+        def refresh(*_):
+            results[:] = self.history.search(query.get(), limit=50)
+            listbox.delete(0, tk.END)
+            for entry in results:
+                listbox.insert(tk.END, format_history_entry(entry))
+            if results:
+                listbox.selection_set(0)
+
+        def choose(_event=None):
+            selection = listbox.curselection()
+            if not selection:
+                return
+            entry_id = results[selection[0]]["id"]
+            # Fenster zuerst schließen, damit das Zielfenster den Fokus zurückbekommt
+            window.destroy()
+            self.history_window = None
+            self.repaste_history(entry_id)
+
+        query.trace_add("write", refresh)
+        search_entry.bind("<Return>", choose)
+        listbox.bind("<Double-Button-1>", choose)
+        listbox.bind("<Return>", choose)
+        window.bind("<Escape>", lambda _event: window.destroy())
+
+        refresh()
+        search_entry.focus_set()
+        self.history_window = window
+
+    def setup_null_gui(self):
+        """Headless: alle Widgets durch NullWidget ersetzen (Replay-Modus, CI ohne Display)"""
+        self.root = NullWidget()
+        self.status_label = NullWidget()
+        self.progress = NullWidget()
+        self.recording_label = NullWidget()
+        self.perf_label = NullWidget()
+        self.model_var = NullWidget(self.model_size)
+        logger.info("Headless-Modus: keine GUI")
 
     def setup_gui(self):
         """Erstellt die Benutzeroberfläche im Dark Mode"""
+        import tkinter as tk
+        from tkinter import ttk
+
         self.root = tk.Tk()
         self.root.title("Spracherkennung")
 
@@ -279,7 +2695,7 @@ class OptimizedSpeechToTextApp:
 
         # Kompaktes Layout mit Dark Mode
         # Status-Label (kombiniert mit Model-Info)
-        status_text = "STRG+Space" if KEYBOARD_AVAILABLE else "STRG+Space / F9"
+        status_text = "STRG+Space" if get_keyboard() else "STRG+Space / F9"
         self.status_label = tk.Label(
             self.root,
             text=f"Bereit • {self.model_size} • {status_text}",
@@ -325,13 +2741,24 @@ class OptimizedSpeechToTextApp:
         # Performance/Info Label
         self.perf_label = tk.Label(
             self.root,
-            text="Auto-Paste aktiv" if PYAUTOGUI_AVAILABLE else "Nur Zwischenablage",
+            text="Auto-Paste aktiv" if get_pyautogui() else "Nur Zwischenablage",
             font=("Segoe UI", 8),
             bg=bg_color,
             fg="#808080"
         )
         self.perf_label.pack(pady=2)
 
+        # Kontextmenü (Rechtsklick): Modell zur Laufzeit wechseln
+        self.model_var = tk.StringVar(value=self.model_size)
+        self.model_menu = tk.Menu(self.root, tearoff=0, bg=progress_bg, fg=fg_color,
+                                  activebackground=accent_color)
+        for size in MODEL_SIZES:
+            self.model_menu.add_radiobutton(label=size, value=size, variable=self.model_var,
+                                            command=lambda size=size: self.switch_model(size))
+        self.model_menu.add_separator()
+        self.model_menu.add_command(label="Verlauf durchsuchen... (STRG+SHIFT+H)", command=self.open_history_window)
+        self.root.bind("<Button-3>", lambda event: self.model_menu.tk_popup(event.x_root, event.y_root))
+
         # Immer im Vordergrund aber dezent
         self.root.attributes('-topmost', True)
         self.root.attributes('-alpha', 0.95)  # Leicht transparent
@@ -368,116 +2795,6 @@ class OptimizedSpeechToTextApp:
         self.root.lift()
         self.root.focus()
         logger.info("Fenster nach vorne geholt und fokussiert")
-        flush_logger()
-
-    def find_aimp(self):
-        """Findet AIMP-Prozess und bereitet Lautstärke-Kontrolle vor"""
-        if not PYCAW_AVAILABLE:
-            logger.debug("pycaw nicht verfügbar - AIMP Kontrolle deaktiviert")
-            return
-
-        try:
-            sessions = AudioUtilities.GetAllSessions()
-            for session in sessions:
-                if session.Process:
-                    process_name = session.Process.name().lower()
-                    # Präzise AIMP-Erkennung (nur aimp.exe oder aimp32.exe)
-                    if process_name in ["aimp.exe", "aimp32.exe", "aimp64.exe"]:
-                        self.aimp_volume_interface = session._ctl.QueryInterface(ISimpleAudioVolume)
-                        logger.info("✅ AIMP gefunden - Lautstärke-Kontrolle aktiviert")
-                        return True
-            logger.info("ℹ️ AIMP nicht gefunden - läuft nicht oder nicht aktiv")
-        except Exception as e:
-            logger.warning(f"⚠️ Fehler beim Suchen nach AIMP: {e}")
-        return False
-
-    def reduce_aimp_volume(self):
-        """Reduziert AIMP Lautstärke während Aufnahme"""
-        logger.debug(f"reduce_aimp_volume() aufgerufen - aimp_volume_interface={self.aimp_volume_interface}")
-        if self.aimp_volume_interface:
-            try:
-                # Aktuelle Lautstärke speichern
-                self.aimp_original_volume = self.aimp_volume_interface.GetMasterVolume()
-                logger.info(f"Aktuelle AIMP-Lautstärke: {self.aimp_original_volume*100:.1f}%")
-
-                # Auf 7% reduzieren
-                self.aimp_volume_interface.SetMasterVolume(self.reduce_volume_percent, None)
-                logger.info(f"🔉 AIMP Lautstärke reduziert: {self.aimp_original_volume*100:.0f}% → {self.reduce_volume_percent*100:.0f}%")
-                flush_logger()
-            except Exception as e:
-                logger.warning(f"Fehler beim Reduzieren der AIMP-Lautstärke: {e}", exc_info=True)
-                flush_logger()
-        else:
-            logger.debug("⚠️ AIMP nicht verfügbar - Lautstärkereduktion übersprungen")
-
-    def restore_aimp_volume(self):
-        """Stellt AIMP Lautstärke sanft wieder her (Fade-In)"""
-        logger.debug(f"restore_aimp_volume() aufgerufen - aimp_volume_interface={self.aimp_volume_interface}, original_volume={self.aimp_original_volume}")
-        if self.aimp_volume_interface and self.aimp_original_volume is not None:
-            try:
-                # Starte Fade-In in separatem Thread für nicht-blockierende Ausführung
-                logger.info(f"Starte AIMP Lautstärke Fade-In: {self.reduce_volume_percent*100:.0f}% → {self.aimp_original_volume*100:.0f}%")
-                flush_logger()
-                fade_thread = threading.Thread(target=self._fade_in_volume, name="AImp-FadeThread")
-                fade_thread.start()
-            except Exception as e:
-                logger.warning(f"Fehler beim Starten des Fade-In Threads: {e}", exc_info=True)
-                flush_logger()
-                # Fallback: Direkt wiederherstellen
-                try:
-                    logger.info(f"Fallback: Stelle AIMP-Lautstärke direkt wieder her auf {self.aimp_original_volume*100:.0f}%")
-                    self.aimp_volume_interface.SetMasterVolume(self.aimp_original_volume, None)
-                    self.aimp_original_volume = None
-                    flush_logger()
-                except Exception as e2:
-                    logger.warning(f"Auch Fallback fehlgeschlagen: {e2}")
-                    flush_logger()
-        else:
-            logger.debug(f"Kann AIMP nicht restaurieren: interface={self.aimp_volume_interface}, volume={self.aimp_original_volume}")
-
-    def _fade_in_volume(self):
-        """Führt das sanfte Fade-In aus"""
-        logger.debug(f"_fade_in_volume() gestartet in Thread {threading.current_thread().name}")
-
-        if not self.aimp_volume_interface or self.aimp_original_volume is None:
-            logger.warning("_fade_in_volume() konnte nicht ausgeführt werden - interface oder volume ist None")
-            flush_logger()
-            return
-
-        try:
-            current_volume = self.reduce_volume_percent
-            target_volume = self.aimp_original_volume
-            step_size = (target_volume - current_volume) / self.fade_steps
-            step_duration = self.fade_duration / self.fade_steps
-
-            logger.info(f"🔊 AIMP Lautstärke-Fade-In: {current_volume*100:.0f}% → {target_volume*100:.0f}% ({self.fade_steps} Schritte à {step_duration*1000:.0f}ms)")
-            flush_logger()
-
-            # Sanftes Fade-In
-            for i in range(self.fade_steps):
-                current_volume += step_size
-                try:
-                    self.aimp_volume_interface.SetMasterVolume(current_volume, None)
-                    logger.debug(f"  Fade-Schritt {i+1}/{self.fade_steps}: {current_volume*100:.1f}%")
-                except Exception as e:
-                    logger.warning(f"Fehler bei Fade-Schritt {i+1}: {e}")
-                    break
-                time.sleep(step_duration)
-
-            # Stelle sicher, dass exakte Ziellautstärke erreicht wird
-            try:
-                self.aimp_volume_interface.SetMasterVolume(target_volume, None)
-                logger.info(f"✅ AIMP Lautstärke wiederhergestellt: {target_volume*100:.0f}%")
-                flush_logger()
-            except Exception as e:
-                logger.warning(f"Fehler beim Setzen der finalen Lautstärke: {e}")
-                flush_logger()
-
-            self.aimp_original_volume = None
-
-        except Exception as e:
-            logger.critical(f"Fehler beim AIMP Fade-In: {e}", exc_info=True)
-            flush_logger()
 
     def show_notification(self, message, is_error=False):
         """Zeigt eine Status-Benachrichtigung an (Dark Mode)"""
@@ -503,6 +2820,7 @@ class OptimizedSpeechToTextApp:
 
     def start_recording(self):
         """Startet die Audioaufnahme"""
+        hotkey_time = time.time()
         logger.info("start_recording() aufgerufen")
         with self.recording_lock:
             if self.is_recording:
@@ -518,21 +2836,33 @@ class OptimizedSpeechToTextApp:
 
             self.is_recording = True
             self.audio_frames = []
+            if self.speculator:
+                self.speculator.reset()
             logger.info("Recording-Flag gesetzt, audio_frames geleert")
 
-        # AIMP Lautstärke reduzieren
-        logger.info("Rufe reduce_aimp_volume() auf...")
-        self.reduce_aimp_volume()
-        flush_logger()
+        self.profiler.begin_dictation()
+
+        # Player-Lautstärke reduzieren (läuft im Ducking-Scheduler)
+        self.ducking.duck()
 
         try:
-            self.stream = self.audio.open(
-                format=self.format,
-                channels=self.channels,
-                rate=self.rate,
-                input=True,
-                frames_per_buffer=self.chunk
-            )
+            preroll_ms = self.preroll.start_capture(self.audio_frames) if self.preroll else None
+            if preroll_ms is None:
+                if self.preroll:
+                    logger.warning("⚠️ Pre-Roll-Stream nicht aktiv - öffne Stream für diese Aufnahme")
+                self.stream = self.audio.open(
+                    format=self.format,
+                    channels=self.channels,
+                    rate=self.rate,
+                    input=True,
+                    frames_per_buffer=self.chunk
+                )
+            self.dictation_metrics = {
+                "mic_open_ms": (time.time() - hotkey_time) * 1000,
+                "preroll_ms": preroll_ms or 0.0,
+            }
+            logger.info(f"Mikrofon bereit nach {self.dictation_metrics['mic_open_ms']:.1f}ms "
+                        f"(Pre-Roll: {self.dictation_metrics['preroll_ms']:.0f}ms)")
 
             self.show_notification("🎤 Aufnahme läuft...")
             self.update_progress(0)
@@ -545,20 +2875,25 @@ class OptimizedSpeechToTextApp:
             self.show_notification(f"❌ Aufnahmefehler: {e}", True)
             with self.recording_lock:
                 self.is_recording = False
-            # AIMP Lautstärke wiederherstellen bei Fehler
-            self.restore_aimp_volume()
+            # Player-Lautstärke wiederherstellen bei Fehler
+            self.ducking.restore()
+            self.profiler.end_dictation()
 
     def record_audio(self):
         """Aufnahme-Loop"""
         start_time = time.time()
         logger.info(f"Aufnahme gestartet (Thread: {threading.current_thread().name})")
-        flush_logger()
 
         try:
             while self.is_recording:
                 try:
-                    data = self.stream.read(self.chunk, exception_on_overflow=False)
-                    self.audio_frames.append(data)
+                    if self.stream:
+                        data = self.stream.read(self.chunk, exception_on_overflow=False)
+                        self.audio_frames.append(data)
+                    else:
+                        time.sleep(0.05)  # Pre-Roll: Frames kommen per Callback
+                    if self.speculator:
+                        self.speculator.observe(self.audio_frames)
 
                     # Fortschritt aktualisieren
                     elapsed = time.time() - start_time
@@ -568,22 +2903,18 @@ class OptimizedSpeechToTextApp:
                     # Maximale Aufnahmedauer prüfen
                     if elapsed >= self.max_recording_time:
                         logger.info(f"Maximale Aufnahmedauer ({self.max_recording_time}s) erreicht")
-                        flush_logger()
                         self.stop_recording()
                         break
 
                 except Exception as e:
                     logger.critical(f"EXCEPTION BEIM AUDIO-LESEN: {type(e).__name__}: {e}", exc_info=True)
-                    flush_logger()
                     break
         except Exception as e:
             logger.critical(f"KRITISCHER FEHLER IN RECORD_AUDIO: {type(e).__name__}: {e}", exc_info=True)
-            flush_logger()
         finally:
             elapsed = time.time() - start_time
             frame_count = len(self.audio_frames)
             logger.info(f"Aufnahme beendet: {elapsed:.2f}s, {frame_count} Frames aufgezeichnet")
-            flush_logger()
 
     def stop_recording(self):
         """Stoppt die Audioaufnahme und startet Transkription"""
@@ -593,14 +2924,17 @@ class OptimizedSpeechToTextApp:
                 logger.debug("Recording war nicht aktiv - return")
                 return
             self.is_recording = False
+            self.stop_time = time.time()
             logger.info("Recording-Flag auf False gesetzt")
 
         self.show_notification("🔄 Verarbeite Aufnahme...")
 
-        # AIMP Lautstärke wiederherstellen
-        logger.info("Rufe restore_aimp_volume() auf...")
-        self.restore_aimp_volume()
-        flush_logger()
+        # Player-Lautstärke per Fade-In wiederherstellen
+        self.ducking.restore()
+
+        # Pre-Roll-Stream bleibt offen, füllt ab jetzt wieder nur den Ringpuffer
+        if self.preroll:
+            self.preroll.stop_capture()
 
         # Stream sicher schließen
         try:
@@ -615,21 +2949,24 @@ class OptimizedSpeechToTextApp:
         self.processing_thread = threading.Thread(target=self.process_audio, daemon=True)
         self.processing_thread.start()
 
-    def save_audio(self):
-        """Speichert die Aufnahme als temporäre Datei"""
-        temp_file = "temp_recording.wav"
-
-        try:
-            wf = wave.open(temp_file, 'wb')
-            wf.setnchannels(self.channels)
-            wf.setsampwidth(self.audio.get_sample_size(self.format))
-            wf.setframerate(self.rate)
-            wf.writeframes(b''.join(self.audio_frames))
-            wf.close()
-            return temp_file
-        except Exception as e:
-            print(f"Fehler beim Speichern: {e}")
-            return None
+    def pcm_to_float(self, audio_bytes):
+        """Wandelt 16-Bit PCM in Float32 (-1..1) für Faster-Whisper um"""
+        import numpy as np
+        return np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+
+    def format_decode_info(self, metrics):
+        """Kurzinfo zu Dekodier-Modus und Sprache für das Performance-Label"""
+        info = ""
+        if metrics.get("decode_mode") == "two-pass":
+            info += f" • {metrics.get('redecoded', 0)}/{metrics.get('segments', 0)} neu"
+        # Aus dem Verlauf eingefügte Texte haben keine Dekodier-Metriken
+        if "language" in metrics and metrics.get("language_source") != "fixed":
+            info += f" • {metrics['language']}"
+            if "detect_time" in metrics:
+                info += f" ({metrics['detect_time']*1000:.0f}ms)"
+        if metrics.get("speculation") in ("hit", "extended"):
+            info += f" • ⚡ {metrics['speculation']}"
+        return info
 
     def clean_text(self, text):
         """Bereinigt den Text (Rechtschreibung + Füllwörter)"""
@@ -670,38 +3007,35 @@ class OptimizedSpeechToTextApp:
                 return
             self.is_processing = True
 
-        temp_file = None
         logger.info(f"Audio-Verarbeitung gestartet (Thread: {threading.current_thread().name})")
 
         try:
-            temp_file = self.save_audio()
-
-            if not temp_file or not os.path.exists(temp_file):
-                logger.error("Audio konnte nicht gespeichert werden")
-                self.show_notification("❌ Aufnahme fehlgeschlagen", True)
-                return
-
-            # Prüfe Dateigröße
-            file_size = os.path.getsize(temp_file)
-            logger.info(f"Temp-Datei erstellt: {temp_file} ({file_size} bytes)")
+            audio_bytes = b''.join(self.audio_frames)
+            logger.info(f"Aufnahme im Speicher: {len(audio_bytes)} bytes")
 
-            if file_size < 1000:
-                logger.warning(f"Audio-Datei sehr klein ({file_size} bytes) - Aufnahme möglicherweise leer")
+            if len(audio_bytes) < 1000:
+                logger.warning(f"Aufnahme sehr klein ({len(audio_bytes)} bytes) - Aufnahme möglicherweise leer")
                 self.show_notification("⚠️ Aufnahme zu kurz/leer", True)
                 return
 
-            if not self.model:
+            if not self.engine.model:
                 logger.error("Whisper-Modell ist nicht geladen")
-                flush_logger()
                 self.show_notification("❌ Modell nicht geladen", True)
                 return
 
+            # Direkt aus dem Speicher transkribieren (kein Umweg über eine WAV-Datei)
+            audio = self.pcm_to_float(audio_bytes)
+
             # Zeitmessung starten
             start_time = time.time()
 
+            # Governor entscheidet anhand von RAM/CPU, welches Modell dekodiert
+            engine, governor_metrics = self.engine, {}
+            if self.governor:
+                engine, governor_metrics = self.governor.admit(self.engine)
+
             # Transkription mit Faster-Whisper
-            logger.info(f"Starte Transkription mit Modell: {self.model_size}")
-            flush_logger()
+            logger.info(f"Starte Transkription mit Modell: {engine.model_size}")
             self.show_notification("📝 Transkribiere (CPU-optimiert)...")
 
             # Robusteres Transcribe mit Exception Handling
@@ -711,26 +3045,26 @@ class OptimizedSpeechToTextApp:
                 process = psutil.Process()
                 mem_info = process.memory_info()
                 logger.info(f"Speicher vor Transkription: RSS={mem_info.rss/1024**2:.1f}MB, VMS={mem_info.vms/1024**2:.1f}MB")
-                flush_logger()
 
-                logger.debug("Rufe transcribe() auf...")
-                flush_logger()
-                segments, info = self.model.transcribe(
-                    temp_file,
-                    language="de",
-                    beam_size=5,
-                    best_of=5,
-                    temperature=0.0,
-                    vad_filter=True,  # Voice Activity Detection
-                    vad_parameters=dict(
-                        min_silence_duration_ms=500
-                    )
-                )
-                logger.info(f"Transkription erfolgreich - Sprachinformation: {info}")
-                flush_logger()
+                with self.governor.decode_priority() if self.governor else nullcontext():
+                    # Spekulatives Ergebnis aus der Sprechpause vor dem Stopp (falls vorhanden).
+                    # Die Spekulation lief mit dem primären Modell → bei Fallback verwerfen
+                    speculated = None
+                    discarded = False
+                    if self.speculator and engine is not self.engine:
+                        discarded = self.speculator.discard()
+                    elif self.speculator:
+                        speculated = self.speculator.finish(audio)
+                    if speculated:
+                        original_text, metrics = speculated
+                    else:
+                        original_text, metrics = engine.transcribe(audio)
+                        if self.speculator:
+                            metrics["speculation"] = "discarded" if discarded else "miss"
+                metrics.update(governor_metrics)
+                logger.info(f"✅ {metrics['segments']} Segmente verarbeitet")
             except Exception as e:
                 logger.critical(f"⚠️ EXCEPTION WÄHREND TRANSCRIBE(): {type(e).__name__}: {e}", exc_info=True)
-                flush_logger()
 
                 # Zusätzliche Debug-Info
                 try:
@@ -739,37 +3073,20 @@ class OptimizedSpeechToTextApp:
                     mem_info = process.memory_info()
                     logger.error(f"Speicher zum Zeitpunkt des Fehlers: RSS={mem_info.rss/1024**2:.1f}MB, VMS={mem_info.vms/1024**2:.1f}MB")
                     logger.error(f"CPU-Prozent: {process.cpu_percent(interval=0.1)}%")
-                    flush_logger()
                 except:
                     pass
 
                 self.show_notification(f"❌ Transkription fehlgeschlagen", True)
                 return
 
-            # Text aus Segmenten zusammenfügen (mit Fehlerbehandlung)
-            original_text = ""
-            try:
-                segment_texts = []
-                logger.debug(f"Beginne Segment-Verarbeitung...")
-                flush_logger()
-
-                for segment in segments:
-                    if hasattr(segment, 'text') and segment.text.strip():
-                        segment_texts.append(segment.text.strip())
-                        logger.debug(f"Segment: {segment.text}")
-                original_text = " ".join(segment_texts).strip()
-                logger.info(f"✅ {len(segment_texts)} Segmente verarbeitet")
-                flush_logger()
-            except Exception as e:
-                logger.critical(f"EXCEPTION BEI SEGMENT-VERARBEITUNG: {type(e).__name__}: {e}", exc_info=True)
-                flush_logger()
-                self.show_notification("❌ Fehler bei der Segmentverarbeitung", True)
-                return
-
             # Zeitmessung stoppen
             processing_time = time.time() - start_time
-            self.perf_label.config(text=f"Verarbeitung: {processing_time:.1f}s")
+            metrics["processing_time"] = processing_time
+            metrics["audio_duration"] = len(audio) / self.rate
+            metrics.update(self.dictation_metrics)
+            self.perf_label.config(text=f"Verarbeitung: {processing_time:.1f}s{self.format_decode_info(metrics)}")
             logger.info(f"Transkription abgeschlossen in {processing_time:.2f}s")
+            logger.info(f"Metriken: {format_metrics(metrics)}")
 
             if not original_text:
                 logger.warning("Keine Sprache erkannt - Text ist leer")
@@ -782,72 +3099,26 @@ class OptimizedSpeechToTextApp:
             cleaned_text = self.clean_text(original_text)
             logger.info(f"Bereinigter Text ({len(cleaned_text)} Zeichen): {cleaned_text[:100]}...")
 
-            # In Zwischenablage kopieren (immer)
-            try:
-                pyperclip.copy(cleaned_text)
-                logger.info("✅ Text in Zwischenablage kopiert")
-            except Exception as e:
-                logger.error(f"Fehler beim Kopieren in Zwischenablage: {e}", exc_info=True)
-                self.show_notification("❌ Fehler beim Kopieren", True)
-                return
-
-            # Auto-Paste wenn möglich
-            if PYAUTOGUI_AVAILABLE:
-                try:
-                    # Kleiner Delay damit Fenster wieder Fokus bekommt
-                    time.sleep(0.2)
-
-                    # Versuche Text automatisch einzufügen wo der Cursor ist
-                    # Methode 1: Mit keyboard library (wenn verfügbar)
-                    if KEYBOARD_AVAILABLE:
-                        logger.info("Verwende keyboard library für Auto-Paste")
-                        kb.press_and_release('ctrl+v')
-                        logger.info("✅ Auto-Paste erfolgreich (keyboard library)")
-                        self.show_notification("✅ Text eingefügt & in Zwischenablage")
-                    else:
-                        # Methode 2: Mit pyautogui
-                        logger.info("Verwende pyautogui für Auto-Paste")
-                        pyautogui.hotkey('ctrl', 'v')
-                        logger.info("✅ Auto-Paste erfolgreich (pyautogui)")
-                        self.show_notification("✅ Text eingefügt & in Zwischenablage")
-
-                    # Performance Info
-                    self.perf_label.config(text=f"Auto-Paste • {processing_time:.1f}s")
-
-                except Exception as e:
-                    # Fallback: Nur Zwischenablage
-                    logger.warning(f"Auto-Paste Fehler: {e}", exc_info=True)
-                    self.show_notification("✅ Text in Zwischenablage (Auto-Paste fehlgeschlagen)")
-            else:
-                # Nur Zwischenablage
-                logger.info("pyautogui nicht verfügbar - nur Zwischenablage")
-                self.show_notification("✅ Text in Zwischenablage kopiert")
-
+            # Ausgabe (Zwischenablage, Auto-Paste, ...) läuft im Output-Worker
+            self.output.submit(cleaned_text, metrics, stop_time=self.stop_time)
+            self.show_notification("📤 Gebe Text aus...")
+            if self.history:
+                self.history.add(cleaned_text, metrics, audio_bytes, self.rate)
+            if self.session_dir:
+                self.save_session(audio_bytes, cleaned_text)
             self.update_progress(0)
 
-            # Kurze Erfolgsmeldung anzeigen
-            success_thread = threading.Thread(target=self.show_success_message, daemon=True)
-            success_thread.start()
-
         except Exception as e:
             logger.critical(f"❌ KRITISCHER FEHLER BEI AUDIO-VERARBEITUNG: {type(e).__name__}: {e}", exc_info=True)
-            flush_logger()
             self.show_notification(f"❌ Verarbeitungsfehler: {str(e)[:50]}", True)
         finally:
             logger.debug("Starte Cleanup nach Audio-Verarbeitung")
-            flush_logger()
 
             # Processing-Flag zurücksetzen
             with self.processing_lock:
                 self.is_processing = False
 
-            # Temporäre Datei löschen
-            try:
-                if temp_file and os.path.exists(temp_file):
-                    os.remove(temp_file)
-                    logger.debug(f"Temp-Datei gelöscht: {temp_file}")
-            except Exception as e:
-                logger.warning(f"Fehler beim Löschen der Temp-Datei: {e}")
+            self.profiler.end_dictation()
 
             # Garbage Collection für besseres Memory-Management
             try:
@@ -857,14 +3128,59 @@ class OptimizedSpeechToTextApp:
                 logger.warning(f"Fehler bei Garbage Collection: {e}")
 
             logger.info("Cleanup abgeschlossen")
-            flush_logger()
+
+    def save_session(self, audio_bytes, text):
+        """Speichert Aufnahme und Text für den Replay-Modus (<Zeit>_<Nr>.wav + .txt)"""
+        try:
+            os.makedirs(self.session_dir, exist_ok=True)
+            self.session_counter += 1
+            base = os.path.join(self.session_dir, f"{datetime.now():%Y%m%d_%H%M%S}_{self.session_counter:03d}")
+            with wave.open(base + ".wav", "wb") as wav_file:
+                wav_file.setnchannels(self.channels)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(self.rate)
+                wav_file.writeframes(audio_bytes)
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+            logger.info(f"💾 Sitzung gespeichert: {base}.wav")
+        except OSError as e:
+            logger.warning(f"Sitzung konnte nicht gespeichert werden: {e}")
+
+    def on_output_delivered(self, job, timings, errors):
+        """Callback des Output-Workers: zeigt das Ergebnis der Ausgabe an"""
+        if "clipboard" in errors:
+            self.show_notification("❌ Fehler beim Kopieren", True)
+            return
+
+        if "paste" in timings:
+            self.show_notification("✅ Text eingefügt & in Zwischenablage")
+            self.perf_label.config(text=f"Auto-Paste • {job['metrics']['processing_time']:.1f}s"
+                                        f"{self.format_decode_info(job['metrics'])}")
+        elif "paste" in errors:
+            self.show_notification("✅ Text in Zwischenablage (Auto-Paste fehlgeschlagen)")
+        elif "clipboard" in timings:
+            self.show_notification("✅ Text in Zwischenablage kopiert")
+        else:
+            self.show_notification("✅ Text ausgegeben")
+
+        # Kurze Erfolgsmeldung anzeigen
+        success_thread = threading.Thread(target=self.show_success_message, daemon=True)
+        success_thread.start()
 
     def show_success_message(self):
         """Zeigt eine kurze Erfolgsmeldung an"""
         time.sleep(2)
-        status_text = "STRG+Space" if KEYBOARD_AVAILABLE else "STRG+Space / F9"
+        status_text = "STRG+Space" if get_keyboard() else "STRG+Space / F9"
         self.show_notification(f"Bereit • {self.model_size} • {status_text}")
-        self.perf_label.config(text="Auto-Paste aktiv" if PYAUTOGUI_AVAILABLE else "Nur Zwischenablage")
+        self.perf_label.config(text="Auto-Paste aktiv" if get_pyautogui() else "Nur Zwischenablage")
+
+    def toggle_profiling(self):
+        """Hotkey-Handler: Profiling für die nächsten Diktate an bzw. vorzeitig aus"""
+        self.profiler.toggle()
+        if self.profiler.is_active():
+            self.show_notification(f"🔬 Profiling für {self.profiler.remaining} Diktate aktiv")
+        else:
+            self.show_notification("🔬 Profiling beendet")
 
     def on_hotkey(self):
         """Hotkey-Handler"""
@@ -875,7 +3191,8 @@ class OptimizedSpeechToTextApp:
 
     def setup_hotkey(self):
         """Richtet den Hotkey-Listener ein (mit besserem globalen Support)"""
-        if KEYBOARD_AVAILABLE:
+        kb = get_keyboard()
+        if kb:
             # Verwende keyboard library für bessere globale Hotkeys
             try:
                 # Registriere globalen Hotkey (suppress=True verhindert Double-Trigger)
@@ -887,6 +3204,15 @@ class OptimizedSpeechToTextApp:
                 kb.add_hotkey('ctrl+shift+r', self.on_hotkey, suppress=True)
                 logger.info("   Alternativ: STRG+SHIFT+R")
 
+                kb.add_hotkey('ctrl+shift+m', self.cycle_model, suppress=True)
+                logger.info("   Modell wechseln: STRG+SHIFT+M")
+
+                kb.add_hotkey('ctrl+shift+h', lambda: self.root.after(0, self.open_history_window), suppress=True)
+                logger.info("   Verlauf durchsuchen: STRG+SHIFT+H")
+
+                kb.add_hotkey('ctrl+shift+p', self.toggle_profiling, suppress=True)
+                logger.info("   Profiling an/aus: STRG+SHIFT+P")
+
                 self.listener = None  # Kein pynput listener nötig
                 return
             except Exception as e:
@@ -898,6 +3224,9 @@ class OptimizedSpeechToTextApp:
         logger.info("   Hinweis: Bei CMD/PowerShell-Problemen:")
         logger.info("   - Klicken Sie einmal auf das Spracherkennungs-Fenster")
         logger.info("   - Oder nutzen Sie F9 als Alternative")
+        logger.info("   - F8 wechselt das Modell, F7 öffnet den Verlauf, F6 schaltet Profiling an/aus")
+        logger.info("   - Rechtsklick öffnet das Menü")
+        from pynput import keyboard
 
         def for_canonical(f):
             return lambda k: f(self.listener.canonical(k))
@@ -911,10 +3240,16 @@ class OptimizedSpeechToTextApp:
         def on_press(key):
             hotkey.press(self.listener.canonical(key))
 
-            # Zusätzlich F9 als Alternative
+            # Zusätzlich F9 als Alternative, F8 wechselt das Modell, F7 öffnet den Verlauf
             try:
                 if key == keyboard.Key.f9:
                     self.on_hotkey()
+                elif key == keyboard.Key.f8:
+                    self.cycle_model()
+                elif key == keyboard.Key.f7:
+                    self.root.after(0, self.open_history_window)
+                elif key == keyboard.Key.f6:
+                    self.toggle_profiling()
             except:
                 pass
 
@@ -945,16 +3280,42 @@ class OptimizedSpeechToTextApp:
             self.is_processing = False
         logger.debug("Processing-Flag gesetzt")
 
-        # AIMP Lautstärke sicherheitshalber wiederherstellen (ohne Fade, direkt)
-        if self.aimp_volume_interface and self.aimp_original_volume is not None:
+        # Ausstehende Ausgaben noch zustellen
+        try:
+            self.output.close()
+            logger.debug("Output-Worker beendet")
+        except Exception as e:
+            logger.warning(f"Fehler beim Beenden des Output-Workers: {e}")
+
+        # Laufendes Profil noch schreiben
+        if self.profiler.thread is not None:
             try:
-                self.aimp_volume_interface.SetMasterVolume(self.aimp_original_volume, None)
-                logger.info(f"🔊 AIMP Lautstärke direkt wiederhergestellt: {self.aimp_original_volume*100:.0f}%")
+                self.profiler.stop()
             except Exception as e:
-                logger.warning(f"Fehler beim Wiederherstellen der AIMP-Lautstärke: {e}")
+                logger.warning(f"Fehler beim Schreiben des Profils: {e}")
+
+        if self.governor:
+            self.governor.close()
+
+        # Ausstehende Verlaufseinträge noch schreiben
+        if self.history:
+            try:
+                self.history.close()
+                logger.debug("Verlauf geschlossen")
+            except Exception as e:
+                logger.warning(f"Fehler beim Schließen des Verlaufs: {e}")
+
+        # Player-Lautstärke sicherheitshalber wiederherstellen (ohne Fade, direkt)
+        try:
+            self.ducking.close()
+            logger.debug("Ducking-Scheduler beendet")
+        except Exception as e:
+            logger.warning(f"Fehler beim Beenden des Ducking-Schedulers: {e}")
 
         # Audio-Stream sicher schließen
         try:
+            if self.preroll:
+                self.preroll.close()
             if self.stream:
                 self.stream.stop_stream()
                 self.stream.close()
@@ -973,7 +3334,8 @@ class OptimizedSpeechToTextApp:
             logger.warning(f"Fehler beim Terminieren von PyAudio: {e}")
 
         # Hotkey cleanup
-        if KEYBOARD_AVAILABLE:
+        kb = get_keyboard()
+        if kb:
             try:
                 kb.unhook_all()
                 logger.info("✅ Globale Hotkeys entfernt")
@@ -989,6 +3351,9 @@ class OptimizedSpeechToTextApp:
         # Modell freigeben
         try:
             self.model = None
+            self.engine.model = None
+            if self.governor and self.governor.fallback_engine:
+                self.governor.fallback_engine.model = None
             gc.collect()
             logger.info("✅ Ressourcen freigegeben")
         except Exception as e:
@@ -1005,43 +3370,553 @@ class OptimizedSpeechToTextApp:
         logger.info("=" * 70)
         logger.info("Anwendung beendet")
         logger.info("=" * 70)
+        flush_logger()
+
+class NullWidget:
+    """Headless-Ersatz für Tk-Fenster, Labels, Fortschrittsbalken und Variablen (Replay-Modus)"""
+
+    def __init__(self, value=None):
+        self.options = {}
+        self.value = value
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    def __getitem__(self, key):
+        return self.options.get(key)
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def after(self, delay_ms, callback, *args):
+        callback(*args)
+
+    def winfo_exists(self):
+        return False
+
+    def update(self):
+        pass
+
+    def mainloop(self):
+        pass
+
+    def quit(self):
+        pass
+
+class ReplayStream:
+    """Eingabe-Stream aus einer vorher aufgenommenen PCM-Sitzung (blockierend oder Callback-Modus)"""
+
+    def __init__(self, source, chunk, stream_callback=None):
+        self.source = source
+        self.chunk = chunk
+        self.callback = stream_callback
+        self.stopped = threading.Event()
+        if stream_callback:
+            threading.Thread(target=self._pump, name="Replay-Stream", daemon=True).start()
+
+    def read(self, num_frames, exception_on_overflow=True):
+        return self.source.next_chunk(num_frames, self.stopped)
+
+    def _pump(self):
+        while not self.stopped.is_set():
+            self.callback(self.source.next_chunk(self.chunk, self.stopped), self.chunk, None, 0)
+
+    def is_active(self):
+        return not self.stopped.is_set()
+
+    def start_stream(self):
+        pass
+
+    def stop_stream(self):
+        self.stopped.set()
+
+    def close(self):
+        self.stopped.set()
+
+class ReplayAudio:
+    """Ersetzt das pyaudio-Modul samt PyAudio-Instanz: liefert geladene PCM-Sitzungen in
+    Echtzeit (speed=1), schneller (speed>1) oder ohne Pause (speed=0), danach Stille"""
+
+    paInt16 = 8
+    paContinue = 0
+
+    def __init__(self, rate=16000, speed=1.0):
+        self.rate = rate
+        self.speed = speed
+        self.lock = threading.Lock()
+        self.pcm = b''
+        self.position = 0
+        self.drained = threading.Event()
+        self.drained.set()
+
+    def PyAudio(self):
+        return self
+
+    def open(self, format=None, channels=1, rate=16000, input=True, frames_per_buffer=1024,
+             stream_callback=None):
+        return ReplayStream(self, frames_per_buffer, stream_callback)
+
+    def terminate(self):
+        pass
+
+    def load(self, pcm):
+        """Nächste Sitzung (16-Bit PCM, mono) bereitstellen"""
+        with self.lock:
+            self.pcm = pcm
+            self.position = 0
+            self.drained.clear()
+
+    def next_chunk(self, num_frames, stopped):
+        size = num_frames * 2
+        chunk_duration = num_frames / self.rate
+        with self.lock:
+            data = self.pcm[self.position:self.position + size]
+            self.position += len(data)
+
+        if not data:
+            # Erst beim nächsten Lesen melden: der letzte Chunk ist dann sicher in der Aufnahme
+            self.drained.set()
+            # Sitzung zu Ende: Stille im Echtzeit-Takt bis der Stream gestoppt wird
+            stopped.wait(chunk_duration)
+            return b'\x00' * size
+        if self.speed > 0:
+            time.sleep(chunk_duration / self.speed)
+        return data.ljust(size, b'\x00')
+
+def create_profiler(args):
+    """Profiler laut CLI; mit --profile-dictations K ist er ab dem ersten Diktat scharf"""
+    profiler = SamplingProfiler(interval_ms=args.profile_interval_ms, dictations=args.profile_dictations or 3)
+    if args.profile_dictations:
+        profiler.arm()
+    return profiler
+
+def normalize_transcript(text):
+    """Vergleichsform für --expect-text: Kleinschreibung, ohne Satzzeichen, einfache Leerzeichen"""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.casefold()).split())
+
+def run_replay(args):
+    """Replay-Modus: spielt aufgenommene Sitzungen durch dieselbe Zustandsmaschine wie die GUI
+    (start_recording → record_audio → stop_recording → process_audio) - ohne Mikrofon, Display
+    oder Hotkeys - und prüft Text und Latenz"""
+    import numpy as np
+
+    paths = expand_audio_paths(args.replay)
+    expected = list(args.expect_text or [])
+    audio = ReplayAudio(speed=args.replay_speed)
+    clipboard = MemorySink("clipboard")
+    paste = MemorySink("paste", depends_on="clipboard")
+
+    app = OptimizedSpeechToTextApp(
+        model_size=args.model,
+        language=args.language,
+        decode_mode=args.decode_mode,
+        redecode_logprob=args.redecode_logprob,
+        redecode_compression=args.redecode_compression,
+        output_sinks=[clipboard, paste],
+        ducking=DuckingService(MockVolumeBackend({("aimp.exe", 1): 0.8}), players=["aimp.exe"]),
+        preroll_ms=args.preroll_ms,
+        governor=None if args.no_governor else ResourceGovernor(
+            min_available_mb=args.governor_min_mb,
+            max_cpu_percent=args.governor_max_cpu
+        ),
+        headless=True,
+        audio_module=audio,
+        profiler=create_profiler(args),
+        speculative_silence_ms=args.speculative_silence_ms if args.speculative else 0
+    )
+    if args.profile_startup:
+        report_startup_profile()
+
+    failed = 0
+    latencies = []
+    try:
+        for index, path in enumerate(paths):
+            blocks = list(iter_audio_file(path))
+            samples = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.float32)
+            audio.load((np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+
+            duration = len(samples) / audio.rate
+            jobs_before = app.output.job_counter
+            delivered_before = len(clipboard.deliveries)
+            app.start_recording()
+
+            # Nicht unbegrenzt warten: record_audio kann selbst stoppen (max_recording_time)
+            # oder abstürzen - dann liest niemand mehr und drained wird nie gesetzt
+            deadline = time.time() + (duration / audio.speed if audio.speed > 0 else 0) + 10.0
+            aborted = None
+            while not audio.drained.wait(0.1):
+                if not app.is_recording or not app.recording_thread.is_alive():
+                    aborted = "Aufnahme vorzeitig beendet"
+                elif time.time() > deadline:
+                    aborted = "Zeitüberschreitung beim Abspielen"
+                if aborted:
+                    break
+            app.stop_recording()
+            app.processing_thread.join()
+
+            text = ""
+            latency_ms = None
+            if app.output.job_counter > jobs_before:
+                clipboard.wait_for(delivered_before + 1, timeout=30)
+                delivered_at, job = clipboard.deliveries[delivered_before]
+                text = job["text"]
+                latency_ms = (delivered_at - job["stop_time"]) * 1000
+                latencies.append(latency_ms)
+
+            problems = [aborted] if aborted else []
+            expected_text = expected[index] if index < len(expected) else None
+            sidecar = os.path.splitext(path)[0] + ".txt"
+            if expected_text is None and os.path.isfile(sidecar):
+                with open(sidecar, encoding="utf-8") as f:
+                    expected_text = f.read().strip()
+            if expected_text is not None and normalize_transcript(text) != normalize_transcript(expected_text):
+                problems.append(f"Text '{text}' ≠ erwartet '{expected_text}'")
+            if latency_ms is None:
+                problems.append("keine Ausgabe")
+            elif args.latency_budget_ms and latency_ms > args.latency_budget_ms:
+                problems.append(f"Latenz {latency_ms:.0f}ms > Budget {args.latency_budget_ms:.0f}ms")
+
+            latency_text = f"{latency_ms:.0f}ms" if latency_ms is not None else "-"
+            if problems:
+                failed += 1
+                logger.error(f"❌ Replay {index + 1}/{len(paths)} {path} ({duration:.1f}s): "
+                             f"Latenz {latency_text} - {'; '.join(problems)}")
+            else:
+                logger.info(f"✅ Replay {index + 1}/{len(paths)} {path} ({duration:.1f}s): "
+                            f"Latenz {latency_text} - '{text}'")
+    finally:
+        app.shutdown()
+
+    if latencies:
+        latencies.sort()
+        logger.info(f"📊 Replay: {len(paths) - failed}/{len(paths)} bestanden, Latenz Stop→Ausgabe "
+                    f"Median {latencies[len(latencies) // 2]:.0f}ms, Max {latencies[-1]:.0f}ms")
+    return 1 if failed else 0
+
+def expand_audio_paths(paths):
+    """Löst Verzeichnisse in die enthaltenen Audiodateien auf (sortiert)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(AUDIO_FILE_EXTENSIONS):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+def run_batch(args):
+    """Headless-Modus: transkribiert Audiodateien ohne GUI, Mikrofon oder Hotkeys"""
+    engine_options = dict(
+        language=args.language,
+        decode_mode=args.decode_mode,
+        redecode_logprob=args.redecode_logprob,
+        redecode_compression=args.redecode_compression
+    )
+
+    # Im Shard-Modus laden nur die Worker-Prozesse ein Modell - einmal für alle Dateien
+    engine = None
+    shard_pool = None
+    if args.shards <= 1:
+        with startup_phase("Modell laden"):
+            model, model_size = load_whisper_model(args.model)
+        if model is None:
+            return 1
+        engine = TranscriptionEngine(model, model_size, **engine_options)
+
+    paths = expand_audio_paths(args.transcribe)
+
+    if args.benchmark_batching:
+        clips = [clip for clip in (read_short_clip(path) for path in paths) if clip is not None]
+        if engine is None or not clips:
+            logger.error("❌ Benchmark benötigt kurze Dateien (≤30s) und ist mit --shards nicht kombinierbar")
+            return 1
+        benchmark_batching(engine, clips, max(2, args.batch_size), args.batch_wait_ms)
+        return 0
+
+    output = OutputDispatcher(create_output_sinks(args.output or "stdout", args.output_file, args.output_socket))
+    if engine is None:
+        shard_pool = create_shard_pool(args.model, engine_options, args.shards, log_level=args.log_level)
+    batcher = None
+    if engine is not None and args.batch_size > 1:
+        batcher = MicroBatcher(engine, max_items=args.batch_size, max_wait_ms=args.batch_wait_ms)
+    if args.profile_startup:
+        report_startup_profile()
+
+    failed = 0
+    batched = []  # (Pfad, Startzeit, Future) kurzer Dateien, Ausgabe in Reihenfolge
+
+    def flush_batched():
+        nonlocal failed
+        for path, start_time, future in batched:
+            try:
+                text, metrics = future.result()
+            except Exception as e:
+                logger.error(f"❌ Fehler bei {path}: {type(e).__name__}: {e}")
+                failed += 1
+                continue
+            logger.info(f"✅ {path}: {format_metrics(metrics)}")
+            output.submit(text, {"file": path, "processing_time": time.time() - start_time})
+        batched.clear()
+
+    for path in paths:
+        logger.info(f"📂 Transkribiere Datei: {path}")
+        start_time = time.time()
+        texts = []
+        audio_duration = 0.0
+        try:
+            clip = read_short_clip(path) if batcher else None
+            if clip is not None:
+                batched.append((path, start_time, batcher.submit(clip)))
+                continue
+
+            flush_batched()
+            if engine is None:
+                text, metrics = transcribe_file_sharded(path, shard_pool, args.shards,
+                                                        shard_seconds=args.shard_seconds)
+                audio_duration = metrics["audio_duration"]
+                logger.info(f"   Sharding: {format_metrics(metrics)}")
+                texts.append(text)
+            else:
+                for offset, text, metrics in transcribe_blocks(engine, iter_audio_file(path)):
+                    audio_duration += metrics["audio_duration"]
+                    logger.info(f"   Fenster ab {offset:.0f}s: {format_metrics(metrics)}")
+                    if text:
+                        texts.append(text)
+        except Exception as e:
+            logger.error(f"❌ Fehler bei {path}: {type(e).__name__}: {e}", exc_info=True)
+            failed += 1
+            continue
+
+        processing_time = time.time() - start_time
+        rtf = processing_time / audio_duration if audio_duration else 0.0
+        logger.info(f"✅ {path}: {audio_duration:.1f}s Audio in {processing_time:.1f}s (RTF {rtf:.2f})")
+        output.submit(" ".join(texts), {"file": path, "processing_time": processing_time})
+
+    flush_batched()
+    if shard_pool:
+        shard_pool.shutdown()
+    if batcher:
+        batcher.close()
+        stats = batcher.stats
+        if stats["batches"]:
+            logger.info(f"📊 Micro-Batching: {stats['items']} Clips in {stats['batches']} Batches "
+                        f"(Ø {stats['items'] / stats['batches']:.1f}), {batcher.throughput():.2f} Clips/s")
+
+    output.close(timeout=None)
+    return 1 if failed else 0
+
+def open_history(args):
+    """Öffnet den Verlauf laut CLI-Optionen (None bei --no-history oder Fehler)"""
+    import sqlite3
+
+    if args.no_history:
+        return None
+    path = args.history_db or os.path.join(os.path.dirname(os.path.abspath(__file__)), "spracherkennung_history.db")
+    try:
+        return TranscriptHistory(path, store_audio=args.history_audio)
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ Verlauf nicht verfügbar ({path}): {e}")
+        return None
+
+def run_history(args):
+    """CLI für den Verlauf: --history-search listet Treffer, --history-paste gibt einen Eintrag erneut aus"""
+    history = open_history(args)
+    if history is None:
+        logger.error("❌ Verlauf ist deaktiviert oder nicht verfügbar")
+        return 1
+
+    try:
+        if args.history_paste is not None:
+            entry = history.get(args.history_paste)
+            if entry is None:
+                logger.error(f"❌ Verlaufseintrag #{args.history_paste} nicht gefunden")
+                return 1
+            output = OutputDispatcher(create_output_sinks(args.output or "clipboard", args.output_file,
+                                                          args.output_socket))
+            output.submit(entry["text"], {"history_id": entry["id"]}, stop_time=time.time())
+            output.close(timeout=None)
+            logger.info(f"📚 Verlaufseintrag #{entry['id']} ausgegeben")
+            return 0
+
+        entries = history.search(args.history_search, limit=args.history_limit)
+        for entry in entries:
+            print(format_history_entry(entry))
+        logger.info(f"📚 {len(entries)} Treffer")
+        return 0
+    finally:
+        history.close()
 
 def main():
     parser = argparse.ArgumentParser(description='CPU-optimierte Spracherkennung mit Faster-Whisper')
     parser.add_argument('--model', '-m', type=str, default='small-int8',
-                       choices=['tiny-int8', 'base-int8', 'small-int8', 'medium-int8',
-                               'tiny', 'base', 'small', 'medium', 'large-v2'],
+                       choices=MODEL_SIZES,
                        help='Faster-Whisper Modellgröße (Standard: small-int8)')
+    parser.add_argument('--language', '-l', type=str, default='de',
+                       help='Sprachcode (z.B. de, en) oder "auto" für einmalige Erkennung pro Sitzung (Standard: de)')
+    parser.add_argument('--decode-mode', type=str, default='beam',
+                       choices=['beam', 'two-pass'],
+                       help='beam: alles mit Beam 5 dekodieren, two-pass: Greedy + Beam nur für '
+                            'unsichere Segmente (Standard: beam)')
+    parser.add_argument('--redecode-logprob', type=float, default=-1.0,
+                       help='Zwei-Pass: Segmente mit avg_logprob unter diesem Wert neu dekodieren (Standard: -1.0)')
+    parser.add_argument('--redecode-compression', type=float, default=2.4,
+                       help='Zwei-Pass: Segmente mit Kompressionsrate über diesem Wert neu dekodieren (Standard: 2.4)')
+    parser.add_argument('--log-level', type=str.upper, default='INFO', choices=LOG_LEVELS,
+                       help='Log-Level für die Console (Standard: INFO)')
+    parser.add_argument('--file-log-level', type=str.upper, default='DEBUG', choices=LOG_LEVELS,
+                       help='Log-Level für spracherkennung.log (Standard: DEBUG)')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Ausgabeziele als Komma-Liste: clipboard, paste, file, stdout, socket '
+                            '(Standard: clipboard,paste - bei --transcribe: stdout)')
+    parser.add_argument('--output-file', type=str, default=None,
+                       help='Datei für das Ausgabeziel "file" (Standard: transkripte.txt)')
+    parser.add_argument('--output-socket', type=str, default='127.0.0.1:50555',
+                       help='HOST:PORT für das Ausgabeziel "socket" (Standard: 127.0.0.1:50555)')
+    parser.add_argument('--speculative', action='store_true',
+                       help='Nach einer Sprechpause schon während der Aufnahme dekodieren; kommt bis zum Stopp '
+                            'keine neue Sprache, ist der Text sofort fertig')
+    parser.add_argument('--speculative-silence-ms', type=int, default=700, metavar='MS',
+                       help='Pausenlänge, ab der spekulativ dekodiert wird (Standard: 700)')
+    parser.add_argument('--preroll-ms', type=int, default=0, metavar='MS',
+                       help='Mikrofon dauerhaft offen halten und die letzten MS Millisekunden vor dem Hotkey '
+                            'voranstellen, z.B. 500 (Standard: 0 = aus, Stream wird pro Aufnahme geöffnet)')
+    parser.add_argument('--replay', type=str, nargs='+', metavar='DATEI',
+                       help='Aufgenommene Sitzungen (WAV/Audio oder Ordner) headless durch Aufnahme und '
+                            'Verarbeitung spielen, Text und Latenz prüfen (Exit-Code 1 bei Fehlern)')
+    parser.add_argument('--replay-speed', type=float, default=1.0, metavar='FAKTOR',
+                       help='Replay: 1 = Echtzeit, 2 = doppelt so schnell, 0 = ohne Pause (Standard: 1)')
+    parser.add_argument('--expect-text', type=str, action='append', metavar='TEXT',
+                       help='Replay: erwarteter Text je Sitzung in Reihenfolge (sonst <Datei>.txt, falls vorhanden)')
+    parser.add_argument('--latency-budget-ms', type=float, default=0.0, metavar='MS',
+                       help='Replay: maximale Latenz von Aufnahme-Stopp bis Ausgabe (Standard: 0 = keine Prüfung)')
+    parser.add_argument('--record-session', type=str, metavar='ORDNER',
+                       help='Jede Aufnahme als WAV + erkannten Text in ORDNER speichern (Fixtures für --replay)')
+    parser.add_argument('--no-governor', action='store_true',
+                       help='Keine RAM/CPU-Prüfung und keine Prioritätsabsenkung vor der Transkription. '
+                            'Die Absenkung wirkt nur unter Windows auf den ganzen Prozess; unter Linux/macOS '
+                            'wird nur der Verarbeitungs-Thread gereniced, nicht die CTranslate2-Rechen-Threads')
+    parser.add_argument('--governor-min-mb', type=int, default=800, metavar='MB',
+                       help='Governor: unter so viel freiem RAM gilt das System als unter Druck (Standard: 800)')
+    parser.add_argument('--governor-max-cpu', type=float, default=85.0, metavar='PROZENT',
+                       help='Governor: über dieser CPU-Last gilt das System als unter Druck (Standard: 85)')
+    parser.add_argument('--governor-fallback', type=str, choices=MODEL_SIZES, metavar='MODELL',
+                       help='Governor: kleineres Modell vorladen und unter Druck stattdessen verwenden '
+                            '(z.B. tiny-int8)')
+    parser.add_argument('--no-history', action='store_true',
+                       help='Transkripte nicht im Verlauf (SQLite) speichern')
+    parser.add_argument('--history-db', type=str, metavar='DATEI',
+                       help='Pfad der Verlaufs-Datenbank (Standard: spracherkennung_history.db neben dem Skript)')
+    parser.add_argument('--history-audio', action='store_true',
+                       help='Zusätzlich die Aufnahme (PCM) im Verlauf speichern')
+    parser.add_argument('--history-search', type=str, nargs='?', const='', metavar='SUCHE',
+                       help='Verlauf durchsuchen (ohne Suchbegriff: neueste Einträge) und beenden')
+    parser.add_argument('--history-paste', type=int, metavar='ID',
+                       help='Verlaufseintrag ID erneut ausgeben (Standard-Ziel: clipboard) und beenden')
+    parser.add_argument('--history-limit', type=int, default=20, metavar='N',
+                       help='Maximale Trefferzahl für --history-search (Standard: 20)')
+    parser.add_argument('--duck-players', type=str, default=",".join(DuckingService.DEFAULT_PLAYERS),
+                       metavar='EXE[,EXE...]',
+                       help='Player-Prozesse, deren Lautstärke während der Aufnahme reduziert wird '
+                            '(Standard: aimp.exe,aimp32.exe,aimp64.exe)')
+    parser.add_argument('--duck-backend', type=str, default='auto', choices=['auto', 'mock', 'off'],
+                       help='Lautstärke-Backend: auto (pycaw, falls installiert), mock (simuliert), off')
+    parser.add_argument('--transcribe', '-t', nargs='+', metavar='DATEI',
+                       help='Headless: Audiodateien (WAV/FLAC/MP3/OGG, beliebige Abtastrate) oder Verzeichnisse '
+                            'transkribieren statt GUI zu starten')
+    parser.add_argument('--shards', type=int, default=0, metavar='PROZESSE',
+                       help='--transcribe: lange Dateien an Sprechpausen teilen und auf so viele Prozesse '
+                            'verteilen, jeder mit eigenem Modell und anteiligen CPU-Kernen (Standard: aus)')
+    parser.add_argument('--shard-seconds', type=float, default=120.0,
+                       help='Ziel-Länge eines Shards in Sekunden (Standard: 120)')
+    parser.add_argument('--batch-size', type=int, default=1, metavar='M',
+                       help='--transcribe: kurze Dateien (≤30s) in Micro-Batches bis M Clips gemeinsam '
+                            'dekodieren (Standard: 1 = aus). Der gebatchte Pfad ist ein einzelner Beam-Durchlauf '
+                            'ohne VAD, Temperatur-Fallback und Logprob-/Kompressions-Prüfung und ignoriert '
+                            '--decode-mode')
+    parser.add_argument('--batch-wait-ms', type=float, default=50.0, metavar='N',
+                       help='Maximale Wartezeit in ms, bis ein Micro-Batch gestartet wird (Standard: 50)')
+    parser.add_argument('--benchmark-batching', action='store_true',
+                       help='Vergleicht den Durchsatz der kurzen Dateien im normalen Pfad und mit Micro-Batching')
+    parser.add_argument('--profile-dictations', type=int, default=0, metavar='K',
+                       help='Stichproben-Profil der nächsten K Diktate als .folded-Datei (Flamegraph) neben '
+                            'spracherkennung.log schreiben; Hotkey STRG+SHIFT+P aktiviert es zur Laufzeit (Standard: 0)')
+    parser.add_argument('--profile-interval-ms', type=float, default=5.0, metavar='MS',
+                       help='Abstand der Profiler-Stichproben in ms (Standard: 5)')
+    parser.add_argument('--profile-startup', action='store_true',
+                       help='Zeigt nach dem Start, wohin die Startzeit geflossen ist (Imports, Modell, GUI, ...)')
     args = parser.parse_args()
 
+    with startup_phase("Logging-Setup"):
+        setup_logging(args.log_level, args.file_log_level)
+
     logger.info("=" * 60)
     logger.info("  Spracherkennung mit Faster-Whisper (CPU-optimiert)")
     logger.info("  Optimiert für i5-7200U / 16GB RAM")
     logger.info(f"  Modell: {args.model}")
+    logger.info(f"  Sprache: {args.language}")
     logger.info("=" * 60)
 
-    if not FASTER_WHISPER_AVAILABLE:
+    if args.history_search is not None or args.history_paste is not None:
+        return run_history(args)
+
+    if get_whisper_model_class() is None:
         logger.critical("❌ Faster-Whisper muss installiert werden:")
         logger.error("pip install faster-whisper")
         logger.error("Dies bietet deutlich bessere CPU-Performance!")
-        return
+        return 1
+
+    if args.transcribe:
+        return run_batch(args)
+
+    if args.replay:
+        return run_replay(args)
 
     # Abhängigkeiten prüfen
     try:
-        import pyaudio
-        import pyperclip
-        import pynput
+        with startup_phase("Abhängigkeiten prüfen"):
+            import pyaudio
+            import pyperclip
+            import pynput
         logger.info("✅ Alle Abhängigkeiten verfügbar")
     except ImportError as e:
         logger.critical(f"❌ Fehlende Abhängigkeit: {e}")
         logger.error("Installieren mit:")
         logger.error("pip install pyaudio faster-whisper pyperclip pynput keyboard psutil")
-        return
+        return 1
 
     try:
         logger.info("Initialisiere Anwendung...")
-        app = OptimizedSpeechToTextApp(model_size=args.model)
+        app = OptimizedSpeechToTextApp(
+            model_size=args.model,
+            language=args.language,
+            decode_mode=args.decode_mode,
+            redecode_logprob=args.redecode_logprob,
+            redecode_compression=args.redecode_compression,
+            output_sinks=create_output_sinks(args.output or "clipboard,paste", args.output_file, args.output_socket),
+            ducking=DuckingService(create_volume_backend(args.duck_backend), players=args.duck_players.split(",")),
+            preroll_ms=args.preroll_ms,
+            history=open_history(args),
+            governor=None if args.no_governor else ResourceGovernor(
+                min_available_mb=args.governor_min_mb,
+                max_cpu_percent=args.governor_max_cpu
+            ),
+            fallback_model=args.governor_fallback,
+            session_dir=args.record_session,
+            profiler=create_profiler(args),
+            speculative_silence_ms=args.speculative_silence_ms if args.speculative else 0
+        )
         logger.info("✅ Anwendung erfolgreich initialisiert")
+        if args.profile_startup:
+            report_startup_profile()
 
         logger.info("Starte GUI...")
         app.run()
@@ -1052,4 +3927,4 @@ def main():
         app.shutdown()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file